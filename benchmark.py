@@ -0,0 +1,718 @@
+#! /usr/bin/env python3
+
+
+def legacy_replace_substring(a_string, original_str, replacement_str):
+    '''
+    copy of the original regex-based 'replace_substring', kept as the baseline
+        for benchmarks
+    '''
+
+    import re
+
+    start_idx = [s.start() for s in re.finditer(original_str, a_string)]
+
+    for i in range(len(start_idx)-1, -1, -1):
+        end_idx = start_idx[i] + len(original_str)
+        new_string = a_string[:start_idx[i]] + replacement_str + a_string[end_idx:]
+        a_string = new_string
+
+    return(a_string)
+
+
+def legacy_custom_corrections(a_string, corrections_dict, tokenizer):
+    '''
+    copy of the original per-key loop that applied customized corrections in
+        'correct_string_misspellings', kept as the baseline for benchmarks
+    '''
+
+    tokens = [w[0] for w in tokenizer(a_string)]
+    for k in corrections_dict:
+        if k in tokens:
+            a_string = legacy_replace_substring(a_string, k, corrections_dict[k])
+
+    return(a_string)
+
+
+def scale_panels(table, text_col_name, scale, misspelling_rate, seed=0):
+    '''
+    returns a flat list of panel strings from 'table', repeated 'scale' times
+    with probability 'misspelling_rate', each word of a panel is replaced by a
+        randomly chosen key from 'custom_corrections', so that the benchmark
+        exercises the corrections (the bundled 'table.csv' contains none)
+    '''
+
+    import random
+    from spell_check import custom_corrections
+
+    random_generator = random.Random(seed)
+    misspellings = sorted(custom_corrections().keys())
+
+    panels = []
+    for _ in range(scale):
+        for panel_list in table[text_col_name]:
+            for panel in panel_list:
+                words = panel.split(' ')
+                for i in range(len(words)):
+                    if random_generator.random() < misspelling_rate:
+                        words[i] = random_generator.choice(misspellings)
+                panels.append(' '.join(words))
+
+    return(panels)
+
+
+def time_function(function, panels, repeats):
+    '''
+    applies 'function' to every panel in 'panels' 'repeats' times and returns
+        the best time in seconds and the list of results from the last repeat
+    '''
+
+    import time
+
+    best_time = float('inf')
+    results = []
+
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        results = [function(p) for p in panels]
+        best_time = min(best_time, time.perf_counter() - start_time)
+
+    return(best_time, results)
+
+
+def benchmark_custom_corrections(panels, repeats=3):
+    '''
+    compares throughput of the original per-key loop with the compiled
+        single-pass correction engine for customized corrections
+    '''
+
+    from enchant.tokenize import get_tokenizer
+    from spell_check import (custom_corrections, compile_corrections,
+                             apply_custom_corrections)
+
+    tokenizer = get_tokenizer('en_US')
+    corrections = custom_corrections()
+    compiled_corrections = compile_corrections(corrections)
+
+    legacy_time, legacy_results = time_function(
+        lambda p: legacy_custom_corrections(p, corrections, tokenizer),
+        panels, repeats)
+    compiled_time, compiled_results = time_function(
+        lambda p: apply_custom_corrections(p, compiled_corrections, tokenizer),
+        panels, repeats)
+
+    # the per-key loop also replaces keys inside longer words (e.g., 'Luc' in
+    #   'Lucy'), so some panels are expected to differ
+    differing = sum(1 for a, b in zip(legacy_results, compiled_results)
+                    if a != b)
+
+    print('Custom corrections on {0} panels (best of {1})'
+          .format(len(panels), repeats))
+    print('  per-key loop:    {0:.3f} s, {1:,.0f} panels/s'
+          .format(legacy_time, len(panels) / legacy_time))
+    print('  compiled engine: {0:.3f} s, {1:,.0f} panels/s'
+          .format(compiled_time, len(panels) / compiled_time))
+    print('  speed-up: {0:.1f}x; panels with different output: {1}'
+          .format(legacy_time / compiled_time, differing))
+
+
+def make_long_strips(panels, panels_per_strip):
+    '''
+    joins consecutive 'panels' into strips of 'panels_per_strip' panels each,
+        to benchmark string rewriting on long texts with many replacements
+    '''
+
+    strips = [' '.join(panels[i:i + panels_per_strip])
+              for i in range(0, len(panels), panels_per_strip)]
+    return(strips)
+
+
+def legacy_rewrite(a_string, replacements):
+    '''
+    applies (word, offset, replacement) 'replacements' the way the original
+        code did, with one call to 'replace_substring' per replacement
+    '''
+
+    for word, _, replacement in replacements:
+        a_string = legacy_replace_substring(a_string, word, replacement)
+
+    return(a_string)
+
+
+def benchmark_span_rewriter(strips, repeats=3):
+    '''
+    compares the original regex-based 'replace_substring', called once per
+        replacement, with the single-pass token-span rewriter on long strips
+    the replacements are the customized corrections found by the tokenizer,
+        so both methods receive the same work
+    '''
+
+    from enchant.tokenize import get_tokenizer
+    from spell_check import (custom_corrections, compile_corrections,
+                             rewrite_token_spans)
+
+    tokenizer = get_tokenizer('en_US')
+    corrections = compile_corrections(custom_corrections())
+
+    replacements = [[(w, p, corrections[w]) for w, p in tokenizer(s)
+                     if w in corrections]
+                    for s in strips]
+    jobs = list(zip(strips, replacements))
+    replacements_len = sum(len(r) for r in replacements)
+
+    legacy_time, _ = time_function(lambda j: legacy_rewrite(*j), jobs, repeats)
+    span_time, _ = time_function(lambda j: rewrite_token_spans(*j), jobs,
+                                 repeats)
+
+    print('Rewriting {0} strips with {1} replacements (best of {2})'
+          .format(len(strips), replacements_len, repeats))
+    print('  replace_substring per replacement: {0:.3f} s, {1:,.0f} strips/s'
+          .format(legacy_time, len(strips) / legacy_time))
+    print('  token-span rewriter:               {0:.3f} s, {1:,.0f} strips/s'
+          .format(span_time, len(strips) / span_time))
+    print('  speed-up: {0:.1f}x'.format(legacy_time / span_time))
+
+
+def benchmark_suggesters(table, text_col_name, dic_filepath, pwl_filepath=None,
+                         repeats=3):
+    '''
+    compares lookups per second of enchant's 'suggest' with the symmetric
+        delete 'SymSpellSuggester' on the same set of misspellings
+    the misspellings are the keys of the customized corrections that enchant
+        flags, so the top suggestion of each method can also be compared with
+        the correction that was chosen by hand
+    '''
+
+    import time
+    import enchant
+    from enchant.tokenize import get_tokenizer
+    from spell_check import (custom_corrections, compile_corrections,
+                             count_corpus_words, build_symspell_suggester)
+
+    if pwl_filepath is None:
+        dictionary = enchant.Dict('en_US')
+    else:
+        dictionary = enchant.DictWithPWL('en_US', pwl_filepath)
+
+    corrections = {k.lower(): v.lower()
+                   for k, v in compile_corrections(custom_corrections()).items()
+                   if ' ' not in k and ' ' not in v}
+    misspellings = sorted(w for w in corrections if not dictionary.check(w))
+
+    start_time = time.perf_counter()
+    word_frequencies = count_corpus_words(table[text_col_name],
+                                          get_tokenizer('en_US'))
+    suggester = build_symspell_suggester(dic_filepath, pwl_filepath,
+                                         word_frequencies)
+    build_time = time.perf_counter() - start_time
+
+    enchant_time, enchant_results = time_function(
+        dictionary.suggest, misspellings, repeats)
+    symspell_time, symspell_results = time_function(
+        suggester.suggest, misspellings, repeats)
+
+    def top_suggestion_matches(results):
+        return(sum(1 for w, r in zip(misspellings, results)
+                   if r and r[0].lower() == corrections[w]))
+
+    print('Suggestions for {0} misspellings (best of {1}); symspell index of '
+          '{2} words and {3} deletes built in {4:.2f} s'
+          .format(len(misspellings), repeats, len(suggester.words),
+                  len(suggester.deletes), build_time))
+    print('  enchant:  {0:.3f} s, {1:,.0f} lookups/s, top suggestion matches '
+          'hand correction: {2}'
+          .format(enchant_time, len(misspellings) / enchant_time,
+                  top_suggestion_matches(enchant_results)))
+    print('  symspell: {0:.3f} s, {1:,.0f} lookups/s, top suggestion matches '
+          'hand correction: {2}'
+          .format(symspell_time, len(misspellings) / symspell_time,
+                  top_suggestion_matches(symspell_results)))
+    print('  speed-up: {0:.1f}x'.format(enchant_time / symspell_time))
+
+
+def generate_synthetic_table(rows_len, misspelling_rate, seed=0,
+                             min_panels=3, max_panels=6):
+    '''
+    returns a table of 'rows_len' synthetic strips with the same columns as the
+        comics table that 'main' in 'spell_check' corrects
+    panels are built from short descriptions and dialogue; with probability
+        'misspelling_rate', each word is replaced by a randomly chosen key from
+        'custom_corrections', which are all real misspellings from the corpus
+    '''
+
+    import datetime
+    import random
+    import pandas as pd
+    from spell_check import custom_corrections
+
+    names = ['Charlie Brown', 'Snoopy', 'Lucy', 'Linus', 'Sally', 'Schroeder',
+             'Peppermint Patty', 'Marcie', 'Woodstock', 'Rerun', 'Franklin']
+    actions = ['walks', 'sighs', 'looks at the kite', 'sits on the doghouse',
+               'holds the football', 'plays the piano', 'is asleep',
+               'smiles', 'leans on the wall', 'frowns', 'runs away',
+               'types on the typewriter', 'hugs the blanket']
+    lines = ['Good grief!', 'I can not stand it.', 'Happiness is a warm puppy.',
+             'This is the year I kick the football.', 'Five cents, please.',
+             'Why me?', 'Rats!', 'Suppertime!', 'My stomach hurts.',
+             'Sweet Babboo!', 'Sir?', 'You blockhead!']
+
+    random_generator = random.Random(seed)
+    misspellings = sorted(custom_corrections().keys())
+
+    def make_panel():
+        name = random_generator.choice(names)
+        if random_generator.random() < 0.5:
+            panel = '{0} {1}.'.format(name, random_generator.choice(actions))
+        else:
+            panel = '{0} says, "{1}"'.format(name,
+                                             random_generator.choice(lines))
+        words = panel.split(' ')
+        for i in range(len(words)):
+            if random_generator.random() < misspelling_rate:
+                words[i] = random_generator.choice(misspellings)
+        return(' '.join(words))
+
+    first_date = datetime.date(1950, 10, 2)
+    pagenames = []
+    texts = []
+    panels_lens = []
+    panels = []
+
+    for j in range(rows_len):
+        strip_panels = [make_panel() for _ in range(
+            random_generator.randint(min_panels, max_panels))]
+        pagenames.append(str(first_date + datetime.timedelta(days=j)))
+        texts.append(''.join(p + '<BR><BR> ' for p in strip_panels))
+        panels_lens.append(len(strip_panels))
+        panels.append(strip_panels)
+
+    table = pd.DataFrame({'pagename': pagenames, 'text': texts,
+                          'num_panels': panels_lens, 'text_by_panels': panels})
+    table = table[['pagename', 'text', 'num_panels', 'text_by_panels']]
+
+    return(table)
+
+
+def benchmark_table_storage(rows_len, work_directory, repeats=3, seed=0):
+    '''
+    compares the time to write and read a synthetic table of 'rows_len' rows,
+        and the file size, in the '^'-separated 'csv' format and in the binary
+        columnar formats, which store the lists of panels natively
+    reading only the column of lists is timed separately
+    '''
+
+    import os
+    import time
+    from spell_check import read_table, write_table
+
+    text_col_name = 'text_by_panels'
+    table = generate_synthetic_table(rows_len, 0.02, seed)
+    table['text_spell_corrected'] = table[text_col_name]
+
+    print('Storing table of {0} rows (best of {1})'.format(rows_len, repeats))
+    print('  {0:<8} {1:>9} {2:>9} {3:>13} {4:>10}'
+          .format('format', 'write s', 'read s', 'read 1 col s', 'size MB'))
+
+    for table_format in ['csv', 'parquet', 'feather']:
+        filepath = os.path.join(work_directory,
+                                'storage_{0}.{1}'.format(rows_len, table_format))
+        times = {'write': float('inf'), 'read': float('inf'),
+                 'read_column': float('inf')}
+
+        try:
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                write_table(table, filepath)
+                times['write'] = min(times['write'],
+                                     time.perf_counter() - start_time)
+
+                start_time = time.perf_counter()
+                read_table(filepath, text_col_name)
+                times['read'] = min(times['read'],
+                                    time.perf_counter() - start_time)
+
+                start_time = time.perf_counter()
+                read_table(filepath, text_col_name, columns=[text_col_name])
+                times['read_column'] = min(times['read_column'],
+                                           time.perf_counter() - start_time)
+        except ImportError as e:
+            print('  {0:<8} skipped: {1}'.format(table_format, e))
+            continue
+
+        print('  {0:<8} {1:>9.3f} {2:>9.3f} {3:>13.3f} {4:>10.1f}'
+              .format(table_format, times['write'], times['read'],
+                      times['read_column'], os.path.getsize(filepath) / 1e6))
+        os.remove(filepath)
+
+
+def benchmark_startup(valid_spell_list_file, character_names_file,
+                      work_directory, repeats=3):
+    '''
+    measures the cold-start time of the script: importing the module in a new
+        interpreter, and preparing the valid spellings, character names and
+        customized corrections either as every run used to (rewriting the
+        personal word list and compiling the corrections) or from the
+        hash-stamped dictionary artifact, when it is built and when it is reused
+    '''
+
+    import os
+    import sys
+    import time
+    import subprocess
+    from spell_check import (make_personal_word_list, read_text_file,
+                             compile_corrections, custom_corrections,
+                             load_dictionary_artifact)
+
+    module_directory = os.path.dirname(os.path.abspath(__file__))
+    pwl_filepath = os.path.join(work_directory, 'valid_spell_list_lower.txt')
+    artifact_filepath = os.path.join(work_directory,
+                                     'dictionary_artifact.pickle')
+
+    def import_module():
+        subprocess.check_call([sys.executable, '-c', 'import spell_check'],
+                              cwd=module_directory)
+
+    def prepare_words():
+        make_personal_word_list(valid_spell_list_file, character_names_file,
+                                pwl_filepath)
+        read_text_file(pwl_filepath)
+        compile_corrections(custom_corrections())
+
+    def build_artifact():
+        if os.path.isfile(artifact_filepath):
+            os.remove(artifact_filepath)
+        load_dictionary_artifact(valid_spell_list_file, character_names_file,
+                                 pwl_filepath, artifact_filepath)
+
+    def load_artifact():
+        load_dictionary_artifact(valid_spell_list_file, character_names_file,
+                                 pwl_filepath, artifact_filepath)
+
+    print('Start-up times (best of {0})'.format(repeats))
+    for name, function in [('import module (new interpreter)', import_module),
+                           ('prepare word lists', prepare_words),
+                           ('build dictionary artifact', build_artifact),
+                           ('load dictionary artifact', load_artifact)]:
+        best_time = float('inf')
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            function()
+            best_time = min(best_time, time.perf_counter() - start_time)
+        print('  {0:<32} {1:8.2f} ms'.format(name, 1000 * best_time))
+
+
+def benchmark_compact_misspellings(rows_len, misspelling_rate, work_directory,
+                                   seed=0):
+    '''
+    compiles the misspellings of a synthetic table of 'rows_len' rows in
+        'work_directory' and compares the memory used by the compiled table
+        with its normalized form from 'compact_misspellings'
+    '''
+
+    import os
+    import time
+    from spell_check import (read_table, compile_misspellings,
+                             compact_misspellings, compact_memory_report,
+                             expand_misspellings)
+
+    text_col_name = 'text_by_panels'
+    table_filepath = os.path.join(work_directory, 'synthetic.csv')
+    table = generate_synthetic_table(rows_len, misspelling_rate, seed)
+    table.to_csv(table_filepath, sep='^', index=False)
+
+    # 'compile_misspellings' writes its files to the working directory
+    current_directory = os.getcwd()
+    os.chdir(work_directory)
+    try:
+        compiled = compile_misspellings(table_filepath,
+                                        suggestion_cache_filepath=None)
+    finally:
+        os.chdir(current_directory)
+
+    start_time = time.perf_counter()
+    compact = compact_misspellings(compiled)
+    compact_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    expand_misspellings(compact, read_table(table_filepath, text_col_name),
+                        text_col_name)
+    expand_time = time.perf_counter() - start_time
+
+    print(compact_memory_report(compiled, compact))
+    print('  compacted in {0:.3f} s, expanded again in {1:.3f} s'
+          .format(compact_time, expand_time))
+
+
+def benchmark_pipeline(rows_len, misspelling_rate, work_directory, seed=0):
+    '''
+    times each stage of the correction pipeline on a synthetic table of
+        'rows_len' strips: loading the table, correcting its rows with
+        'correct_rows' (customized corrections, the enchant check and the
+        suggestions for the flagged words, as 'correct_string_misspellings'
+        times them), and writing the corrected table
+    the suggestion cache is kept only in memory, so that the 'suggest' stage
+        measures enchant for each distinct flagged word
+    returns dictionary of results; 'total' is the elapsed time of all stages
+    '''
+
+    import os
+    import time
+    from spell_check import (read_table, write_table, load_spell_checker,
+                             correct_rows, make_run_stats, StageTimer)
+
+    text_col_name = 'text_by_panels'
+    input_filepath = os.path.join(work_directory,
+                                  'synthetic_{0}.csv'.format(rows_len))
+    output_filepath = os.path.join(work_directory,
+                                   'synthetic_{0}_out.csv'.format(rows_len))
+
+    generate_synthetic_table(rows_len, misspelling_rate, seed).to_csv(
+        input_filepath, sep='^', index=False)
+
+    resources = load_spell_checker(None, [], suggestion_cache_filepath=None)
+    stats = make_run_stats()
+    timings = {}
+
+    start_time = time.perf_counter()
+
+    with StageTimer(timings, 'load'):
+        table = read_table(input_filepath, text_col_name)
+
+    rows = table[text_col_name].tolist()
+    corrected_rows, _ = correct_rows(rows, resources, stats=stats)
+    for stage in ['custom_corrections', 'enchant_check', 'suggest']:
+        timings[stage] = stats['timings'][stage]
+
+    with StageTimer(timings, 'write'):
+        table['text_spell_corrected'] = corrected_rows
+        write_table(table, output_filepath)
+
+    total_time = time.perf_counter() - start_time
+
+    resources['suggestion_cache'].close()
+    os.remove(input_filepath)
+    os.remove(output_filepath)
+
+    panels_len = stats['counters']['panels']
+    results = {'rows': rows_len,
+               'panels': panels_len,
+               'misspelling_rate': misspelling_rate,
+               'checker_errors': stats['counters']['checker_errors'],
+               'stages': timings,
+               'total': total_time,
+               'panels_per_second': panels_len / total_time}
+
+    return(results)
+
+
+def get_git_revision():
+    '''
+    returns abbreviated hash of the current git commit, or 'None' if it is not
+        available
+    '''
+
+    import subprocess
+
+    try:
+        revision = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+
+    return(revision)
+
+
+def record_benchmark_history(results, history_filepath):
+    '''
+    appends 'results' of a benchmark run to the JSON history file and returns
+        the most recent earlier result for the same number of rows and
+        misspelling rate, or 'None' if there is none
+    '''
+
+    import os
+    import json
+
+    history = []
+    if os.path.isfile(history_filepath):
+        with open(history_filepath, encoding='utf-8') as history_file:
+            history = json.load(history_file)
+
+    previous = None
+    for earlier in history:
+        if (earlier['rows'] == results['rows'] and
+                earlier['misspelling_rate'] == results['misspelling_rate']):
+            previous = earlier
+
+    history.append(results)
+    with open(history_filepath, 'w', encoding='utf-8') as history_file:
+        json.dump(history, history_file, indent=2)
+
+    return(previous)
+
+
+def print_pipeline_results(results, previous=None):
+    '''
+    prints the stage timings in 'results' from 'benchmark_pipeline', with the
+        change relative to the 'previous' results if they are provided
+    '''
+
+    print('Pipeline on {0} rows, {1} panels, {2} flagged words'
+          .format(results['rows'], results['panels'],
+                  results['checker_errors']))
+
+    stages = list(results['stages'].items()) + [('total', results['total'])]
+    for stage, seconds in stages:
+        line = '  {0:<20} {1:9.3f} s'.format(stage, seconds)
+        if previous is not None:
+            if stage == 'total':
+                previous_seconds = previous['total']
+            else:
+                previous_seconds = previous['stages'].get(stage)
+            if previous_seconds:
+                line += '  ({0:+.1f}% vs {1})'.format(
+                    100 * (seconds - previous_seconds) / previous_seconds,
+                    previous.get('revision') or previous.get('timestamp'))
+        print(line)
+
+    print('  {0:,.0f} panels/s'.format(results['panels_per_second']))
+
+
+def main():
+    '''
+    runs benchmarks of the spell-checking pipeline
+    'micro' runs micro-benchmarks on the bundled 'table.csv', scaled up to a
+        larger number of panels
+    'suggest' compares lookups per second of enchant's suggestions with the
+        symmetric delete suggester
+    'storage' compares writing and reading the table as 'csv', 'parquet' and
+        'feather' files
+    'startup' measures the cold-start time of the script
+    'compact' compares the memory used by the compiled misspellings table
+        and by its normalized form
+    'pipeline' times each stage of the pipeline on synthetic tables and records
+        the results to a JSON history, so that regressions are visible from run
+        to run
+    '''
+
+    import argparse
+    import datetime
+    import tempfile
+    from spell_check import read_table
+
+    parser = argparse.ArgumentParser(
+        description=main.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='benchmark')
+    subparsers.required = True
+
+    micro_parser = subparsers.add_parser('micro')
+    micro_parser.add_argument('--table', default='table.csv',
+                              help='table of comics to scale up')
+    micro_parser.add_argument('--scale', type=int, default=2500,
+                              help='number of times the table is repeated')
+    micro_parser.add_argument('--misspelling-rate', type=float, default=0.05,
+                              help='fraction of words replaced by misspellings')
+    micro_parser.add_argument('--repeats', type=int, default=3,
+                              help='number of timed repetitions')
+    micro_parser.add_argument('--panels-per-strip', type=int, default=200,
+                              help='number of panels joined into each long '
+                              'strip for the span rewriter benchmark')
+
+    suggest_parser = subparsers.add_parser('suggest')
+    suggest_parser.add_argument('--table', default='table.csv',
+                                help='table of comics for word frequencies')
+    suggest_parser.add_argument('--dictionary-words',
+                                default='/usr/share/hunspell/en_US.dic',
+                                help='Hunspell dictionary file with the words '
+                                'for the symspell suggester')
+    suggest_parser.add_argument('--pwl', default=None,
+                                help='personal word list added to both '
+                                'suggesters')
+    suggest_parser.add_argument('--repeats', type=int, default=3,
+                                help='number of timed repetitions')
+
+    storage_parser = subparsers.add_parser('storage')
+    storage_parser.add_argument('--rows', type=int, default=100000,
+                                help='number of synthetic rows to store')
+    storage_parser.add_argument('--repeats', type=int, default=3,
+                                help='number of timed repetitions')
+
+    startup_parser = subparsers.add_parser('startup')
+    startup_parser.add_argument('--valid-spell-list',
+                                default='valid_spell_list.txt',
+                                help='file of valid spellings')
+    startup_parser.add_argument('--character-names',
+                                default='character_names.txt',
+                                help='file of character names')
+    startup_parser.add_argument('--repeats', type=int, default=3,
+                                help='number of timed repetitions')
+
+    compact_parser = subparsers.add_parser('compact')
+    compact_parser.add_argument('--rows', type=int, default=100000,
+                                help='number of synthetic rows to compile')
+    compact_parser.add_argument('--misspelling-rate', type=float,
+                                default=0.02,
+                                help='fraction of words replaced by '
+                                'misspellings')
+    compact_parser.add_argument('--seed', type=int, default=0,
+                                help='seed for the synthetic table')
+
+    pipeline_parser = subparsers.add_parser('pipeline')
+    pipeline_parser.add_argument('--rows', type=int, nargs='+',
+                                 default=[1000, 10000, 100000],
+                                 help='numbers of synthetic rows to benchmark')
+    pipeline_parser.add_argument('--misspelling-rate', type=float,
+                                 default=0.02,
+                                 help='fraction of words replaced by '
+                                 'misspellings')
+    pipeline_parser.add_argument('--seed', type=int, default=0,
+                                 help='seed for the synthetic tables')
+    pipeline_parser.add_argument('--history', default='benchmark_history.json',
+                                 help='JSON file of earlier results')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'micro':
+        text_col_name = 'text_by_panels'
+        table = read_table(args.table, text_col_name)
+        panels = scale_panels(table, text_col_name, args.scale,
+                              args.misspelling_rate)
+
+        benchmark_custom_corrections(panels, args.repeats)
+        benchmark_span_rewriter(
+            make_long_strips(panels, args.panels_per_strip), args.repeats)
+
+    elif args.benchmark == 'suggest':
+        text_col_name = 'text_by_panels'
+        table = read_table(args.table, text_col_name)
+        benchmark_suggesters(table, text_col_name, args.dictionary_words,
+                             args.pwl, args.repeats)
+
+    elif args.benchmark == 'storage':
+        with tempfile.TemporaryDirectory() as work_directory:
+            benchmark_table_storage(args.rows, work_directory, args.repeats)
+
+    elif args.benchmark == 'startup':
+        with tempfile.TemporaryDirectory() as work_directory:
+            benchmark_startup(args.valid_spell_list, args.character_names,
+                              work_directory, args.repeats)
+
+    elif args.benchmark == 'compact':
+        with tempfile.TemporaryDirectory() as work_directory:
+            benchmark_compact_misspellings(args.rows, args.misspelling_rate,
+                                           work_directory, args.seed)
+
+    elif args.benchmark == 'pipeline':
+        revision = get_git_revision()
+        with tempfile.TemporaryDirectory() as work_directory:
+            for rows_len in args.rows:
+                results = benchmark_pipeline(rows_len, args.misspelling_rate,
+                                             work_directory, args.seed)
+                results['revision'] = revision
+                results['timestamp'] = datetime.datetime.now().isoformat()
+                previous = record_benchmark_history(results, args.history)
+                print_pipeline_results(results, previous)
+
+
+if __name__ == '__main__':
+    main()
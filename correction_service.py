@@ -0,0 +1,449 @@
+#! /usr/bin/env python3
+
+
+def make_service_metrics(max_latencies=10000):
+    '''
+    returns dictionary for counts and for the latencies of the most recent
+        'max_latencies' requests of the correction service
+    '''
+
+    from collections import Counter, deque
+
+    metrics = {'counters': Counter(), 'latencies': deque(maxlen=max_latencies)}
+
+    return(metrics)
+
+
+def service_metrics_report(metrics):
+    '''
+    returns dictionary with request, batch and spell-checker counts and the
+        latency percentiles, in milliseconds, of the recent requests
+    '''
+
+    from spell_check import percentile
+
+    counters = metrics['counters']
+    latencies = sorted(metrics['latencies'])
+
+    report = dict(counters)
+    if counters['batches']:
+        report['mean_batch_size'] = counters['requests'] / counters['batches']
+    report['latency_ms'] = {
+        'p50': 1000 * percentile(latencies, 0.5),
+        'p99': 1000 * percentile(latencies, 0.99),
+        'max': 1000 * percentile(latencies, 1)}
+
+    return(report)
+
+
+def correct_request_batch(panels_list, resources):
+    '''
+    corrects each list of panels in 'panels_list' with 'correct_panels' and the
+        spell-checking 'resources' from 'load_spell_checker'
+    returns list of (corrected panels, number of flagged words) pairs
+    new suggestions are saved to the suggestion cache after each batch
+    '''
+
+    from collections import Counter
+    from spell_check import correct_panels
+
+    results = []
+    for panels in panels_list:
+        counters = Counter()
+        corrected = correct_panels(panels, resources, counters)
+        results.append((corrected, counters['checker_errors']))
+
+    resources['suggestion_cache'].flush()
+
+    return(results)
+
+
+class CorrectionService(object):
+    '''
+    serves 'correct_string_misspellings' to other stages of the pipeline, so
+        that the dictionary, checker, tokenizer and customized corrections are
+        loaded only once
+    each connection sends one JSON object per line:  either
+        {"id": ..., "panels": [...]}, which is answered with the corrected
+        panels, the number of flagged words and the latency of the request, or
+        {"id": ..., "command": "metrics"}, which is answered with the metrics
+        of the service
+    requests are queued and corrected in batches of up to 'batch_size', by
+        waiting up to 'batch_delay' seconds for more requests; the batches are
+        corrected in a single thread, so that the event loop keeps accepting
+        requests
+    the enchant objects and the suggestion cache's SQLite connection must stay
+        in that thread, so the spell-checking resources are created there by
+        calling 'load_resources' (e.g., 'load_spell_checker' with its
+        arguments), and are closed there by 'close'
+    at most 'max_concurrent' requests are queued or being corrected at once;
+        further requests wait, and their wait is included in their latency
+    on shutdown, 'fail_requests' answers the requests that were not corrected
+        with an error, so that their connections can close
+    '''
+
+    def __init__(self, load_resources, batch_size=32, batch_delay=0.002,
+                 max_concurrent=64):
+
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.queue = asyncio.Queue()
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.resources = self.executor.submit(load_resources).result()
+        self.metrics = make_service_metrics()
+        self.connections = {}
+        self.batch = []
+        self.closing_error = None
+
+    def fail_requests(self, error):
+        '''
+        fails the queued requests, the requests being corrected and any later
+            requests with 'error'
+        '''
+
+        self.closing_error = error
+        while not self.queue.empty():
+            self.batch.append(self.queue.get_nowait())
+        for _, future in self.batch:
+            if not future.done():
+                future.set_exception(error)
+        self.batch = []
+
+    def close(self):
+        '''
+        closes the open connections, the suggestion cache and the correction
+            thread
+        returns future that is done when the connections are closed
+        '''
+
+        import asyncio
+
+        for writer in self.connections:
+            writer.close()
+        closed = asyncio.gather(*self.connections.values())
+
+        self.executor.submit(self.resources['suggestion_cache'].close).result()
+        self.executor.shutdown()
+
+        return(closed)
+
+    async def process_batches(self):
+        '''
+        corrects the queued requests in batches until cancelled
+        '''
+
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+
+        while True:
+            self.batch = []
+            batch = self.batch
+            batch.append(await self.queue.get())
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(),
+                                                        timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.metrics['counters']['batches'] += 1
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, correct_request_batch,
+                    [panels for panels, _ in batch], self.resources)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def correct(self, panels):
+        '''
+        returns corrected 'panels', the number of flagged words and the latency
+            of the request in seconds
+        '''
+
+        import time
+        import asyncio
+
+        start_time = time.perf_counter()
+
+        async with self.semaphore:
+            if self.closing_error is not None:
+                raise self.closing_error
+            future = asyncio.get_event_loop().create_future()
+            await self.queue.put((panels, future))
+            corrected, checker_errors = await future
+
+        latency = time.perf_counter() - start_time
+        counters = self.metrics['counters']
+        counters['requests'] += 1
+        counters['panels'] += len(panels)
+        counters['checker_errors'] += checker_errors
+        self.metrics['latencies'].append(latency)
+
+        return(corrected, checker_errors, latency)
+
+    async def respond(self, line, writer):
+        '''
+        answers the request on 'line' through 'writer'
+        '''
+
+        import json
+
+        request_id = None
+        try:
+            message = json.loads(line.decode('utf-8'))
+            request_id = message.get('id')
+            if message.get('command') == 'metrics':
+                response = {'metrics': service_metrics_report(self.metrics)}
+            else:
+                panels = message['panels']
+                if (not isinstance(panels, list) or
+                        not all(isinstance(p, str) for p in panels)):
+                    raise ValueError("'panels' must be a list of strings")
+                corrected, checker_errors, latency = await self.correct(panels)
+                response = {'panels': corrected,
+                            'checker_errors': checker_errors,
+                            'latency_ms': 1000 * latency}
+        except (ValueError, KeyError, AttributeError) as e:
+            self.metrics['counters']['invalid_requests'] += 1
+            response = {'error': '{0}: {1}'.format(type(e).__name__, e)}
+        except Exception as e:
+            self.metrics['counters']['failed_requests'] += 1
+            response = {'error': '{0}: {1}'.format(type(e).__name__, e)}
+
+        response['id'] = request_id
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+
+    async def handle_connection(self, reader, writer):
+        '''
+        answers each request line from 'reader'; the requests of a connection
+            are corrected concurrently, so responses can arrive out of order
+            and are matched to requests by their 'id'
+        '''
+
+        import asyncio
+
+        self.metrics['counters']['connections'] += 1
+        self.connections[writer] = asyncio.get_event_loop().create_future()
+        tasks = []
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    tasks.append(asyncio.ensure_future(
+                        self.respond(line, writer)))
+                    tasks = [t for t in tasks if not t.done()]
+            if tasks:
+                await asyncio.wait(tasks)
+            await writer.drain()
+        except ConnectionError:
+            for task in tasks:
+                task.cancel()
+        finally:
+            writer.close()
+            self.connections.pop(writer).set_result(None)
+
+
+def request_correction(panels, socket_filepath=None, host='127.0.0.1',
+                       port=8765, request_id=None):
+    '''
+    sends 'panels' to a running correction service, through the Unix socket
+        at 'socket_filepath' if it is provided or else through 'host' and
+        'port', and returns the service's response as a dictionary
+    '''
+
+    import json
+    import socket
+
+    if socket_filepath is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_filepath)
+    else:
+        connection = socket.create_connection((host, port))
+
+    try:
+        request = {'id': request_id, 'panels': panels}
+        connection.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with connection.makefile('rb') as response_file:
+            response = json.loads(response_file.readline().decode('utf-8'))
+    finally:
+        connection.close()
+
+    return(response)
+
+
+def parse_arguments(argv=None):
+    '''
+    parses command-line arguments for 'main'
+    '''
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Serves spelling corrections of Peanuts comics descriptions')
+    parser.add_argument('--socket', default=None,
+                        help='path of Unix socket to listen on; if it is not '
+                        'provided, the service listens on localhost')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='localhost port to listen on')
+    parser.add_argument('--batch-size', type=int, default=32,
+                        help='maximum number of requests corrected together')
+    parser.add_argument('--batch-delay', type=float, default=0.002,
+                        help='seconds to wait for more requests to fill a '
+                        'batch')
+    parser.add_argument('--max-concurrent', type=int, default=64,
+                        help='maximum number of requests queued or being '
+                        'corrected at once')
+    parser.add_argument('--prefilter', action='store_true',
+                        help='accept words that the spell checker is known to '
+                        'accept without calling enchant')
+    parser.add_argument('--skip-noise', action='store_true',
+                        help='leave flagged words that look like sound effects '
+                        'or strings of random letters as they are')
+    parser.add_argument('--segment', action='store_true',
+                        help='split flagged run-together words into the words '
+                        'that they are made of')
+    parser.add_argument('--secondary-languages', nargs='*', default=None,
+                        metavar='LANGUAGE',
+                        help='accept flagged words that are correct in these '
+                        'languages or that are sung syllables')
+    parser.add_argument('--dictionary-words',
+                        default='/usr/share/hunspell/en_US.dic',
+                        help='Hunspell dictionary file with the words for the '
+                        'prefilter')
+    parser.add_argument('--table', default=None,
+                        help='table of comics whose words are added to the '
+                        'words for the prefilter and whose common short words '
+                        'are used for segmentation, as in '
+                        '\'spell_check.py\'; default is \'table.csv\' in the '
+                        'sibling folder \'04_divide_text\'')
+
+    args = parser.parse_args(argv)
+
+    if args.batch_size < 1:
+        parser.error('--batch-size must be at least 1')
+    if args.max_concurrent < 1:
+        parser.error('--max-concurrent must be at least 1')
+
+    return(args)
+
+
+def main(argv=None):
+    '''
+    Runs a long-running service that corrects descriptions of Peanuts comics
+    The dictionary, checker, tokenizer and customized corrections are loaded
+        once, from the same files in the present working directory as
+        'spell_check.py' uses, and requests are answered until the service is
+        interrupted
+    Requests and responses are JSON objects, one per line, over a Unix socket
+        ('--socket') or a localhost port ('--port'); see 'CorrectionService'
+        and 'request_correction'
+    '''
+
+    import os
+    import json
+    import signal
+    import asyncio
+    from spell_check import (load_dictionary_artifact, load_spell_checker,
+                             load_known_words, WordSegmenter,
+                             SecondaryDictionaries, get_sibling_directory_path,
+                             read_table, count_corpus_words)
+
+    args = parse_arguments(argv)
+
+    pwl_filepath = 'valid_spell_list_lower.txt'
+    artifact = load_dictionary_artifact(
+        'valid_spell_list.txt', 'character_names.txt', pwl_filepath)
+
+    # the words of the comics are added to the words for the prefilter, as
+    #   'spell_check.py' does, so that inflected forms, which the dictionary
+    #   file holds only as stems, are included; their frequencies let the
+    #   segmenter use common short words
+    word_frequencies = {}
+    if args.prefilter or args.segment:
+        from enchant.tokenize import get_tokenizer
+        table_filepath = args.table
+        if table_filepath is None:
+            table_filepath = os.path.join(
+                get_sibling_directory_path('04_divide_text'), 'table.csv')
+        text_col_name = 'text_by_panels'
+        word_frequencies = count_corpus_words(
+            read_table(table_filepath, text_col_name,
+                       columns=[text_col_name])[text_col_name],
+            get_tokenizer('en_US'))
+
+    def load_resources():
+        resources = load_spell_checker(
+            pwl_filepath, artifact['character_names'],
+            'suggestion_cache.sqlite', corrections_dict=artifact['corrections'],
+            skip_noise=args.skip_noise)
+        if args.secondary_languages is not None:
+            resources['secondary_dictionaries'] = SecondaryDictionaries(
+                args.secondary_languages)
+        if args.prefilter:
+            resources['known_words'] = load_known_words(
+                pwl_filepath, args.dictionary_words,
+                list(artifact['valid_words']) + list(word_frequencies))
+        if args.segment:
+            resources['segmenter'] = WordSegmenter(pwl_filepath,
+                                                   word_frequencies)
+        return(resources)
+
+    loop = asyncio.get_event_loop()
+    service = CorrectionService(load_resources, args.batch_size,
+                                args.batch_delay, args.max_concurrent)
+
+    if args.socket is not None:
+        server = loop.run_until_complete(asyncio.start_unix_server(
+            service.handle_connection, path=args.socket))
+        address = args.socket
+    else:
+        server = loop.run_until_complete(asyncio.start_server(
+            service.handle_connection, host='127.0.0.1', port=args.port))
+        address = '127.0.0.1:{0}'.format(args.port)
+
+    batches = asyncio.ensure_future(service.process_batches())
+
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, loop.stop)
+
+    print('Serving spelling corrections on {0}'.format(address))
+    try:
+        loop.run_forever()
+    finally:
+        # a second signal must not stop the loop while it is shutting down
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signal_number)
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        batches.cancel()
+        loop.run_until_complete(asyncio.wait([batches]))
+        service.fail_requests(
+            ConnectionAbortedError('the service is shutting down'))
+        loop.run_until_complete(service.close())
+        if args.socket is not None and os.path.exists(args.socket):
+            os.remove(args.socket)
+        print(json.dumps(service_metrics_report(service.metrics), indent=2))
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -17,268 +17,1710 @@ def get_sibling_directory_path(sibling_directory_name):
     return(sibling_directory_path)
 
 
-def read_table(table_filepath, column_of_lists):
+def compute_file_hash(filepath):
     '''
-    reads table from 'csv' file
+    returns hexadecimal SHA-1 hash of the contents of the file at 'filepath'
+    returns empty string if 'filepath' is 'None'
+    '''
+
+    import hashlib
+
+    if filepath is None:
+        return('')
+
+    file_hash = hashlib.sha1()
+    with open(filepath, 'rb') as hashed_file:
+        for block in iter(lambda: hashed_file.read(65536), b''):
+            file_hash.update(block)
+
+    return(file_hash.hexdigest())
+
+
+def get_table_format(table_filepath):
+    '''
+    returns storage format of table file from its extension: 'parquet',
+        'feather' or, for any other extension, 'csv'
+    '''
+
+    import os
+
+    extension = os.path.splitext(table_filepath)[1].lower()
+    if extension in ('.parquet', '.feather'):
+        return(extension[1:])
+    return('csv')
+
+
+def read_table(table_filepath, column_of_lists, columns=None):
+    '''
+    reads table from 'csv', 'parquet' or 'feather' file, depending on the file
+        extension (see 'get_table_format')
     each item in column 'column_of_lists' is read as a list; as currently
         written, the function can read only 1 column as a list
+    in a 'csv' file, the lists are stored as their Python representations and
+        must be parsed; 'parquet' and 'feather' files store them natively
+    if 'columns' is provided, only those columns are read
+    'parquet' and 'feather' files require 'pyarrow'
     '''
 
     import pandas as pd
-    from ast import literal_eval
 
-    # '^' used as separator because it does not appear in any text descriptions
-    table = pd.read_csv(table_filepath, sep='^',
-                        converters={column_of_lists: literal_eval})
+    table_format = get_table_format(table_filepath)
+
+    if table_format == 'parquet':
+        table = pd.read_parquet(table_filepath, columns=columns)
+    elif table_format == 'feather':
+        table = pd.read_feather(table_filepath, columns=columns)
+    else:
+        from ast import literal_eval
+        # '^' used as separator because it does not appear in any text
+        #   descriptions
+        table = pd.read_csv(table_filepath, sep='^', usecols=columns,
+                            converters={column_of_lists: literal_eval})
+        return(table)
+
+    # list columns are read as arrays
+    if column_of_lists in table.columns:
+        table[column_of_lists] = [list(e) for e in table[column_of_lists]]
 
     return(table)
 
 
-def compile_misspellings(table_filepath, force_recompile=False):
+def write_table(table, table_filepath):
     '''
-    compiles table of misspellings and suggested corrections from spell checker
-        using a U.S. English dictionary
+    writes table to 'csv', 'parquet' or 'feather' file, depending on the file
+        extension (see 'get_table_format')
     '''
 
-    import os
-    import enchant
-    from enchant.checker import SpellChecker
-    import pandas as pd
+    table_format = get_table_format(table_filepath)
 
-    compiled_filename = 'compiled_misspellings.csv'
+    if table_format == 'parquet':
+        table.to_parquet(table_filepath, index=False)
+    elif table_format == 'feather':
+        table.reset_index(drop=True).to_feather(table_filepath)
+    else:
+        table.to_csv(table_filepath, sep='^', index=False)
 
-    if not force_recompile:
-        if os.path.isfile(compiled_filename):
-            compiled = read_table(compiled_filename, 'suggestions')
-            return(compiled)
 
-    table = read_table(table_filepath, 'text_by_panels')
-    table_col = 3
-    dictionary = enchant.Dict('en_US')
-    #checker = enchant.checker.SpellChecker(dictionary)     # produces error
-    checker = SpellChecker(dictionary)
-
-    filenames = []
-    panel_numbers = []
-    containing_text = []
-    misspellings = []
-    suggestions = []
-
-    for i in range(len(table)):
-        text = table.iloc[i, table_col]
-        for j in range(len(text)):
-            checker.set_text(text[j])
-            for e in checker:
-                filenames.append(table.iloc[i, 0])
-                panel_numbers.append(j)
-                containing_text.append(text[j])
-                misspellings.append(e.word)
-                suggestions.append(dictionary.suggest(e.word))
-
-    compiled = pd.DataFrame({'filename': filenames,
-                             'panel_index': panel_numbers,
-                             'containing_text': containing_text,
-                             'misspellings': misspellings,
-                             'suggestions': suggestions})
-    compiled = compiled[['filename', 'panel_index', 'containing_text',
-                         'misspellings', 'suggestions']]
-    compiled.to_csv(compiled_filename, sep='^', index=False)
+class SuggestionCache(object):
+    '''
+    caches the results of 'dictionary.suggest()', which is by far the slowest
+        call in the spell-checking pipeline
+    suggestions are kept in a size-bounded, least-recently-used in-memory layer
+        and in an on-disk SQLite layer, so that repeated words within a run and
+        across runs do not call the spell checker's 'suggest' again
+    cached suggestions are keyed by the word, the dictionary language, and the
+        hash of the personal word list (PWL), so that changing the word list
+        invalidates previously cached suggestions
+    if 'cache_filepath' is 'None', only the in-memory layer is used
+    '''
 
-    return(compiled)
+    def __init__(self, dictionary, pwl_hash='',
+                 cache_filepath='suggestion_cache.sqlite',
+                 max_memory_size=20000, max_disk_size=200000):
 
+        import sqlite3
+        from collections import OrderedDict
 
-def print_df_strings(a_dataframe, search_string, search_column, show_column):
+        self.dictionary = dictionary
+        self.language = dictionary.tag
+        self.pwl_hash = pwl_hash
+        self.max_memory_size = max_memory_size
+        self.max_disk_size = max_disk_size
+
+        self.memory = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.pending = []
+
+        self.connection = None
+        if cache_filepath:
+            # generous timeout so that several processes can share the file
+            self.connection = sqlite3.connect(cache_filepath, timeout=60)
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS suggestions ('
+                'word TEXT, language TEXT, pwl_hash TEXT, suggestions TEXT, '
+                'last_used REAL, PRIMARY KEY (word, language, pwl_hash))')
+            self.connection.commit()
+
+    def suggest(self, word):
+        '''
+        returns list of suggested corrections for 'word', calling the spell
+            checker only if the suggestions are not already cached
+        '''
+
+        import json
+        import time
+
+        if word in self.memory:
+            self.memory.move_to_end(word)
+            self.memory_hits += 1
+            return(list(self.memory[word]))
+
+        suggestions = None
+
+        if self.connection is not None:
+            row = self.connection.execute(
+                'SELECT suggestions FROM suggestions '
+                'WHERE word = ? AND language = ? AND pwl_hash = ?',
+                (word, self.language, self.pwl_hash)).fetchone()
+            if row is not None:
+                suggestions = json.loads(row[0])
+                self.disk_hits += 1
+
+        if suggestions is None:
+            suggestions = self.dictionary.suggest(word)
+            self.misses += 1
+
+        # 'last_used' is updated for disk hits, too, so that pruning of the
+        #   disk layer removes the least recently used suggestions
+        if self.connection is not None:
+            self.pending.append((word, self.language, self.pwl_hash,
+                                 json.dumps(suggestions), time.time()))
+            if len(self.pending) >= 1000:
+                self.flush()
+
+        self.memory[word] = tuple(suggestions)
+        if len(self.memory) > self.max_memory_size:
+            self.memory.popitem(last=False)
+
+        return(list(suggestions))
+
+    def flush(self):
+        '''
+        writes newly cached suggestions to the disk layer and prunes the least
+            recently used suggestions if the disk layer exceeds its maximum size
+        '''
+
+        if self.connection is None:
+            return()
+
+        if self.pending:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO suggestions VALUES (?, ?, ?, ?, ?)',
+                self.pending)
+            self.pending = []
+
+        row_count = self.connection.execute(
+            'SELECT COUNT(*) FROM suggestions').fetchone()[0]
+        if row_count > self.max_disk_size:
+            self.connection.execute(
+                'DELETE FROM suggestions WHERE rowid IN ('
+                'SELECT rowid FROM suggestions ORDER BY last_used LIMIT ?)',
+                (row_count - self.max_disk_size,))
+
+        self.connection.commit()
+
+    def close(self):
+        '''
+        flushes the disk layer and closes its connection
+        '''
+
+        if self.connection is not None:
+            self.flush()
+            self.connection.close()
+            self.connection = None
+
+    def counts(self):
+        '''
+        returns dictionary of hit and miss counts
+        '''
+
+        counts = {'memory_hits': self.memory_hits,
+                  'disk_hits': self.disk_hits,
+                  'misses': self.misses}
+        return(counts)
+
+    def report(self):
+        '''
+        returns string summarizing cache hits and misses
+        '''
+
+        return(suggestion_cache_report(self.counts()))
+
+
+def suggestion_cache_report(counts):
     '''
-    prints strings from a dataframe for visual inspection
+    returns string summarizing the hit and miss 'counts' of one or more
+        'SuggestionCache's
     '''
 
-    for i in range(len(a_dataframe)):
-        #if search_string in a_dataframe.iloc[i, search_column]:
-        if search_string == a_dataframe.iloc[i, search_column]:
-            print(search_string)
-            print(a_dataframe.iloc[i, show_column])
-            print('\n')
+    lookups = counts['memory_hits'] + counts['disk_hits'] + counts['misses']
+    hit_rate = 0
+    if lookups:
+        hit_rate = 100 * (lookups - counts['misses']) / lookups
+    report = ('Suggestion cache: {0} lookups, {1} memory hits, {2} disk '
+              'hits, {3} misses ({4:.1f}% hit rate)'
+              .format(lookups, counts['memory_hits'], counts['disk_hits'],
+                      counts['misses'], hit_rate))
+    return(report)
 
 
-def write_list_to_text_file(a_list, text_file_name, overwrite_or_append = 'a'):
+class PanelMemo(object):
     '''
-    writes a list of strings to a text file
-    appends by default; change to overwriting by setting to 'w' instead of 'a'
+    memoizes the corrected text, the number of flagged words and the counts of
+        flagged words resolved without suggestions (e.g., 'noise_sound_effect'
+        or 'segmented') of whole panels in 'correct_string_misspellings',
+        because many panels repeat verbatim across strips (e.g., 'Charlie Brown
+        sighs.')
+    like 'SuggestionCache', results are kept in a size-bounded, least-recently-
+        used in-memory layer and in an on-disk SQLite layer, which several
+        worker processes and later runs can share
+    results on disk are keyed by the hash of the panel text and by 'version',
+        which must change whenever the correction of a panel could change
+        (e.g., a hash of the personal word list, the customized corrections and
+        the suggester), so that outdated results are never used
+    the seconds that each panel took to correct are memoized with it, so that
+        the time saved by the memo can be counted
+    if 'memo_filepath' is 'None', only the in-memory layer is used
     '''
 
-    try:
-        textfile = open(text_file_name, overwrite_or_append, encoding = 'utf-8')
-        for element in a_list:
-            textfile.write(element)
-            textfile.write('\n')
+    def __init__(self, version, memo_filepath='panel_memo.sqlite',
+                 max_memory_size=50000, max_disk_size=500000):
 
-    finally:
-        textfile.close()
+        import sqlite3
+        from collections import OrderedDict
 
+        self.version = version
+        self.max_memory_size = max_memory_size
+        self.max_disk_size = max_disk_size
 
-def read_text_file(text_filename, as_string=False):
+        self.memory = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.hit_seconds = 0
+        self.miss_seconds = 0
+        self.saved_seconds = 0
+        self.pending = []
+
+        self.connection = None
+        if memo_filepath:
+            # generous timeout so that several processes can share the file
+            self.connection = sqlite3.connect(memo_filepath, timeout=60)
+            # a table from before the counts were memoized is only a cache, so
+            #   it is dropped rather than migrated
+            columns = [c[1] for c in self.connection.execute(
+                'PRAGMA table_info(panels)')]
+            if columns and 'counts' not in columns:
+                self.connection.execute('DROP TABLE panels')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS panels ('
+                'panel_hash TEXT, version TEXT, corrected TEXT, '
+                'checker_errors INTEGER, counts TEXT, seconds REAL, '
+                'last_used REAL, '
+                'PRIMARY KEY (panel_hash, version))')
+            self.connection.commit()
+
+    def get(self, panel):
+        '''
+        returns memoized (corrected panel, number of flagged words, counts) for
+            'panel', or 'None' if it has not been memoized
+        '''
+
+        import time
+        import json
+        import hashlib
+
+        start_time = time.perf_counter()
+
+        if panel in self.memory:
+            self.memory.move_to_end(panel)
+            self.memory_hits += 1
+        else:
+            if self.connection is None:
+                return(None)
+            panel_hash = hashlib.sha1(panel.encode('utf-8')).hexdigest()
+            row = self.connection.execute(
+                'SELECT corrected, checker_errors, counts, seconds FROM panels '
+                'WHERE panel_hash = ? AND version = ?',
+                (panel_hash, self.version)).fetchone()
+            if row is None:
+                return(None)
+            self.disk_hits += 1
+            self.remember(panel, row[0], row[1], json.loads(row[2]), row[3],
+                          panel_hash)
+
+        corrected, checker_errors, counts, seconds = self.memory[panel]
+        self.saved_seconds += seconds
+        self.hit_seconds += time.perf_counter() - start_time
+
+        return(corrected, checker_errors, counts)
+
+    def put(self, panel, corrected, checker_errors, seconds, counts=None):
+        '''
+        memoizes 'corrected' 'panel', its number of flagged words and the
+            'counts' of its flagged words that were resolved without
+            suggestions, which took 'seconds' to correct
+        '''
+
+        import hashlib
+
+        if counts is None:
+            counts = {}
+
+        self.misses += 1
+        self.miss_seconds += seconds
+        self.remember(panel, corrected, checker_errors, dict(counts), seconds,
+                      hashlib.sha1(panel.encode('utf-8')).hexdigest())
+
+    def remember(self, panel, corrected, checker_errors, counts, seconds,
+                 panel_hash):
+        '''
+        adds result to the in-memory layer and queues it for the disk layer
+        '''
+
+        import time
+        import json
+
+        # 'last_used' is updated for disk hits, too, so that pruning of the
+        #   disk layer removes the least recently used panels
+        if self.connection is not None:
+            self.pending.append((panel_hash, self.version, corrected,
+                                 checker_errors, json.dumps(counts), seconds,
+                                 time.time()))
+            if len(self.pending) >= 1000:
+                self.flush()
+
+        self.memory[panel] = (corrected, checker_errors, counts, seconds)
+        if len(self.memory) > self.max_memory_size:
+            self.memory.popitem(last=False)
+
+    def flush(self):
+        '''
+        writes newly memoized panels to the disk layer and prunes the least
+            recently used panels if the disk layer exceeds its maximum size
+        '''
+
+        if self.connection is None:
+            return()
+
+        if self.pending:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO panels VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self.pending)
+            self.pending = []
+
+        row_count = self.connection.execute(
+            'SELECT COUNT(*) FROM panels').fetchone()[0]
+        if row_count > self.max_disk_size:
+            self.connection.execute(
+                'DELETE FROM panels WHERE rowid IN ('
+                'SELECT rowid FROM panels ORDER BY last_used LIMIT ?)',
+                (row_count - self.max_disk_size,))
+
+        self.connection.commit()
+
+    def close(self):
+        '''
+        flushes the disk layer and closes its connection
+        '''
+
+        if self.connection is not None:
+            self.flush()
+            self.connection.close()
+            self.connection = None
+
+    def counts(self):
+        '''
+        returns dictionary of hit and miss counts, of the seconds spent on hits
+            and misses, and of the seconds that the hits took to correct when
+            they were memoized
+        '''
+
+        counts = {'memory_hits': self.memory_hits,
+                  'disk_hits': self.disk_hits,
+                  'misses': self.misses,
+                  'hit_seconds': self.hit_seconds,
+                  'miss_seconds': self.miss_seconds,
+                  'saved_seconds': self.saved_seconds}
+        return(counts)
+
+
+def panel_memo_report(counts):
     '''
-    reads each line in a text file as a list item and returns list by default
-    if 'as_string' is 'True', reads entire text file as a single string
+    returns string summarizing the 'counts' of one or more 'PanelMemo's:  the
+        rate of duplicate panels, which were memoized, and the time saved by
+        not correcting them again
     '''
 
-    text_list = []
+    hits = counts['memory_hits'] + counts['disk_hits']
+    lookups = hits + counts['misses']
+    duplicate_rate = 0
+    if lookups:
+        duplicate_rate = 100 * hits / lookups
+    saved_seconds = counts['saved_seconds'] - counts['hit_seconds']
+    report = ('Panel memo: {0} panels, {1} memory hits, {2} disk hits '
+              '({3:.1f}% duplicate panels), about {4:.3f} s saved'
+              .format(lookups, counts['memory_hits'], counts['disk_hits'],
+                      duplicate_rate, saved_seconds))
+    return(report)
 
-    try:
-        with open(text_filename) as text:
-            if as_string:
-                # reads text file as single string
-                text_list = text.read().replace('\n', '')
-            else:
-                # reads each line of text file as item in a list
-                for line in text:
-                    text_list.append(line.rstrip('\n'))
-            text.close()
-        return(text_list)
 
-    except:
-        return('There was an error while trying to read the file')
+def read_hunspell_words(dic_filepath):
+    '''
+    reads the words of a Hunspell/MySpell dictionary file (e.g., 'en_US.dic',
+        which enchant uses for its 'en_US' dictionary)
+    the first line of the file holds the number of words; affix flags after
+        '/' are removed, so only the stem words are returned
+    '''
 
+    words = []
 
-def make_valid_spellings_list(misspell_table, return_list=True):
+    with open(dic_filepath, encoding='utf-8', errors='ignore') as dic_file:
+        next(dic_file)
+        for line in dic_file:
+            word = line.split('/')[0].strip()
+            if word:
+                words.append(word)
+
+    return(words)
+
+
+def count_corpus_words(rows, tokenizer):
     '''
-    sets up and documents process for manually viewing and editing
-        'misspell_table' into a 'valid_spell_list' that provides a customized
-        list of words that the spell checker will accept
-    the original list of misspellings, from an initial run of the spell checker,
-        found 3743 misspellings
-    in editing the text file of the list, I scrutinized frequent misspellings
-        closely, which included reading the original context and sometimes
-        referring to the comic itself
-    less frequent misspellings were reviewed more quickly with special attention
-        for possible character names; generally for these less frequent words, I
-        removed them (thereby letting the next run of the spell checker change
-        them) only if I was quite confident that the misspelling didn't
-        accurately transcribe the comic and that the spell checker would pick
-        the correct substitute
-    I included some notes as comments below on my choices; the notes include a
-        category of 'words that are retained and are not corrected by 1st
-        checker option', which will require customized attention to correct
-    if 'return_list' is 'True', the edited list is read from its text file and
-        returned
+    returns 'collections.Counter' of lowercased tokens in 'rows', each of which
+        is a list of panels
     '''
 
-    # counts of how many times each misspelled word occurs
-    #misspell_counts = misspell_table['misspellings'].value_counts()
-    #misspell_count_list = list(misspell_counts.keys())
+    from collections import Counter
 
-    # create files of the original and edited word lists
-    original_list_file = 'misspell_list.txt'
-    valid_spell_list_file = 'valid_spell_list.txt'
-    write_list_to_text_file(original_list_file, original_list_file, 'w')
-    # WARNING:  The line below will overwrite the manually edited file
-    #write_list_to_text_file(original_list_file, valid_spell_list_file, 'w')
+    word_frequencies = Counter()
+    for panels in rows:
+        for panel in panels:
+            word_frequencies.update(w.lower() for w, _ in tokenizer(panel))
 
+    return(word_frequencies)
+
+
+def edit_distance(a_string, other_string, max_distance):
     '''
-    # view words manually and interactively to determine whether to retain them
-    word = 'Saslly'
-    i = misspell_count_list.index(word)
-    print_df_strings(misspell_table, list(misspell_count_list)[i], 3, 2)
-    print_df_strings(misspell_table, list(misspell_count_list)[i], 3, 4)
-    print_df_strings(misspell_table, list(misspell_count_list)[i], 3, 0)
+    returns the optimal string alignment (restricted Damerau-Levenshtein)
+        distance between 'a_string' and 'other_string', i.e., the number of
+        insertions, deletions, substitutions and transpositions of adjacent
+        characters that turn one into the other
+    returns 'max_distance' + 1 as soon as the distance is known to exceed
+        'max_distance'
     '''
 
-    # NOTES ON MANUAL EDITING PROCESS
-    #
-    #
-    # words that are retained:
-    #
-    # "'im", which is accurately transcribed and is short for "him"
-    # "ve", which is part of "I've"
-    # "de" is from French dialogue
-    # "da" is from singing
-    # 'ka', which is an accurate transcription of Snoopy's thought
-    # "te" is from singing
-    # "dum" is from singing
-    # 'goodby' accurately transcribes the comic
-    # 'Il' is from French dialogue
-    # 'VATDHKWXJUFIBLSCNOQGEYR' accurately transcribes the comic
-    #
-    #
-    # words that are retained and are not corrected by 1st checker option:
-    #
-    # an 'i' with a squiggly mark over it; should be an apostrophe
-    # "say's" misspells 'says'; spell checker option #3 corrects it
-    # 'Charie' misspells 'Charlie'; spell checker option #2 corrects it
-    # 'Salley' misspells 'Sally'; spell checker option #2 corrects it
-    # 'loks' misspells 'looks'; spell checker option #2 corrects it
-    # 'Beaglscout' misspells 'Beaglescout'; spell checker doesn't correct it
-    # 'Bown' misspells 'Brown'; spell checker option #3 corrects it
-    # 'Lius' misspells 'Linus'; spell checker option #3 corrects it
-    # 'eys' misspells 'eyes'; spell checker option #4 corrects it
-    # 'ozzes' misspells 'ounces'; spell checker doesn't correct it
-    # 'Charlei' misspells 'Charlie'; spell checker option #2 corrects it
-    # 'Linu' misspells 'Linus'; spell checker option #2 corrects it
-    # 'disterbense' misspells 'disturbance'; I haven't checked the comic
-    # 'Luc' misspells 'Lucy'; spell checker option #5 corrects it
-    # 'Vioet' misspells 'Violet'; spell checker option #2 corrects it
-    # 'hom' misspells 'home'; spell checker option #7 corrects it
-    # 'son't' misspells 'don't'; spell checker option #2 corrects it
-    # 'blandet' misspells 'blanket'; spell checker option #3 corrects it
-    # 'mit' misspells 'mitt' in one comic but is correct German in another
-    # 'Charle' misspells 'Charlie'; spell checker option #2 corrects it
-    # 'Salluy' misspells 'Sally'; spell checker option #2 corrects it
-    # 'ZSNOOPY' misspells 'Z SNOOPY'; spell checker option #2 corrects it
-    # 'legionaires' misspells 'legionnaires'; spell checker option #2 corrects it
-    # 'Patrcia' misspells 'Patricia'; spell checker option #2 corrects it
-    # 'Suppertie' misspells 'Suppertime'; spell checker doesn't correct it
-    # 'Barown' misspells 'Brown'; spell checker option #2 corrects it
-    # 'bBrown' misspells 'Brown'; spell checker option #3 corrects it
-    # 'Brownas' misspells 'Brown as'; spell checker option #2 corrects it
-    # 'ZBrown' misspells 'Brown'; spell checker option #2 corrects it
-    # 'Woodst' misspells 'Woodstock'; spell checker doesn't correct it
-    # 'Beagscout' misspells 'Beaglescout'; spell checker doesn't correct it
-    # 'ZZMarcie' misspells 'ZZ Marcie'; spell checker doesn't correct it
-    # 'Paty' misspells 'Patty'; spell checker option #3 corrects it
-    # 'Reun' misspells 'Rerun'; spell checker option #5 corrects it
-    # 'Bhown' misspells 'Brown'; spell checker option #2 corrects it
-    # 'Lcy' misspells 'Lucy'; spell checker option #3 corrects it
-    # 'Saly' misspells 'Sally'; spell checker option #4 corrects it
-    # 'Charli' misspells 'Charlie'; spell checker option #2 corrects it
-    # 'Mrcie' misspells 'Marcie'; spell checker option #2 corrects it
-    # 'VBrown' misspells 'Brown'; spell checker option #2 corrects it
-    # 'Beeth' misspells 'Beethoven'; spell checker option #2 corrects it
-    # 'Cameroun' misspells 'Cameroon'; spell checker option #2 corrects it
-    # 'Pepperiment' misspells 'Peppermint'; spell checker option #3 corrects it
-    # 'Sallu' misspells 'Sally'; spell checker option #4 corrects it
-    # 'Flinstone' misspells 'Flintstone'; spell checker doesn't correct it
-    # 'Marce' misspells 'Marcie'; spell checker option #4 corrects it
-    # 'Rereun's' misspells 'Rerun's'; spell checker option #4 corrects it
-    # 'Lcu' misspells 'Lucy'; spell checker option doesn't correct it
-    # 'Patt' misspells 'Patty'; spell checker option doesn't correct it
-    # 'blockhed' misspells 'blockhead'; spell checker option option #2 corrects it
-    # 'Serman' misspells 'Shermy'; spell checker option doesn't correct it
-    # 'Barown' misspells 'Brown'; spell checker option #2 corrects it
-    # 'skake' misspells 'skate'; spell checker option #2 corrects it
-    #
-    #
-    # words that are not retained and are corrected by 1st checker option:
-    #
-    # originally, I relied on the spell checker to correct these, but in
-    # validation/quality checking, I noticed a case where 'Snooey' was changed
-    # to 'snoot' instead of 'Snoopy'; this called into question how consistently
-    # the checker handles all these cases below, so I've moved them to the
-    # customized dictionary in 'custom_corrections' to be safe
-    #
-    # 'Shroeder' misspells 'Schroeder'; spell checker corrects it
-    # 'CHarlie' misspells 'Charlie'; spell checker corrects it
-    # 'SNoopy' misspells 'Snoopy'; spell checker corrects it
-    # 'Chalrie' misspells 'Charlie'; spell checker corrects it
-    # 'Schroder' misspells 'Schroeder'; spell checker corrects it
-    #
-    # 'Chrlie' misspells 'Charlie'; spell checker corrects it
-    # 'Charllie' misspells 'Charlie'; spell checker corrects it
-    # 'Chrarlie' misspells 'Charlie'; spell checker corrects it
-    # 'Charliee' misspells 'Charlie'; spell checker corrects it
-    # 'TCharlie' misspells 'Charlie'; spell checker corrects it
-    # 'Chralie' misspells 'Charlie'; spell checker corrects it
-    # 'Cahrlie' misspells 'Charlie'; spell checker corrects it
-    # 'Charlies' misspells 'Charlie'; spell checker corrects it
+    if abs(len(a_string) - len(other_string)) > max_distance:
+        return(max_distance + 1)
+
+    previous_previous_row = None
+    previous_row = list(range(len(other_string) + 1))
+
+    for i in range(1, len(a_string) + 1):
+        row = [i] + [0] * len(other_string)
+        for j in range(1, len(other_string) + 1):
+            cost = 0 if a_string[i - 1] == other_string[j - 1] else 1
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1,
+                         previous_row[j - 1] + cost)
+            if (i > 1 and j > 1 and a_string[i - 1] == other_string[j - 2] and
+                    a_string[i - 2] == other_string[j - 1]):
+                row[j] = min(row[j], previous_previous_row[j - 2] + 1)
+        if min(row) > max_distance:
+            return(max_distance + 1)
+        previous_previous_row = previous_row
+        previous_row = row
+
+    return(previous_row[-1])
+
+
+class SymSpellSuggester(object):
+    '''
+    suggests corrections with the symmetric delete algorithm (as in SymSpell)
+        as a fast, in-process alternative to enchant's 'suggest'
+    every deletion of up to 'max_edit_distance' characters from the first
+        'prefix_length' characters of each word is precomputed into an index;
+        a lookup generates the same deletions of the misspelling, so candidate
+        words are found by dictionary lookups instead of by searching
+    suggestions are ranked by edit distance and then by 'word_frequencies'
+        (e.g., from 'count_corpus_words'), so that words that are common in the
+        comics, like character names, are preferred
+    words are lowercased, because the text is lowercased before it is checked
+    the suggester has a 'tag' and a 'version' hash, so that it can be used in
+        place of the dictionary in a 'SuggestionCache'
+    '''
+
+    def __init__(self, words, word_frequencies=None, max_edit_distance=2,
+                 prefix_length=7, max_suggestions=10, tag='en_US-symspell'):
+
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.max_suggestions = max_suggestions
+        self.tag = tag
+
+        if word_frequencies is None:
+            word_frequencies = {}
+
+        self.words = sorted({w.lower() for w in words})
+        self.frequencies = [word_frequencies.get(w, 0) for w in self.words]
+        self.word_set = set(self.words)
+        self.max_word_length = max([len(w) for w in self.words] + [0])
+
+        # index maps each deletion to the indices of the words that produce it
+        self.deletes = {}
+        for i, word in enumerate(self.words):
+            for delete in self.make_deletes(word[:prefix_length]):
+                self.deletes.setdefault(delete, []).append(i)
+
+        self.version = hash_object([tag, max_edit_distance, prefix_length,
+                                    self.words, self.frequencies])
+
+    def make_deletes(self, word):
+        '''
+        returns set of 'word' and all strings made by deleting up to
+            'max_edit_distance' characters from it
+        '''
+
+        deletes = {word}
+        edits = {word}
+        for _ in range(self.max_edit_distance):
+            edits = {e[:i] + e[i + 1:] for e in edits for i in range(len(e))}
+            deletes.update(edits)
+
+        return(deletes)
+
+    def suggest(self, word):
+        '''
+        returns list of up to 'max_suggestions' words within
+            'max_edit_distance' of 'word', ranked by edit distance and corpus
+            frequency
+        '''
+
+        word = word.lower()
+        if len(word) - self.max_edit_distance > self.max_word_length:
+            return([])
+
+        candidates = set()
+        for delete in self.make_deletes(word[:self.prefix_length]):
+            candidates.update(self.deletes.get(delete, ()))
+
+        ranked = []
+        for i in candidates:
+            distance = edit_distance(word, self.words[i],
+                                     self.max_edit_distance)
+            if distance <= self.max_edit_distance:
+                ranked.append((distance, -self.frequencies[i], self.words[i]))
+
+        ranked.sort()
+        suggestions = [r[2] for r in ranked[:self.max_suggestions]]
+
+        return(suggestions)
+
+
+def build_symspell_suggester(dic_filepath, pwl_filepath=None,
+                             word_frequencies=None, dictionary=None,
+                             known_words=None):
+    '''
+    builds a 'SymSpellSuggester' from the words of the Hunspell dictionary at
+        'dic_filepath' and, if provided, the personal word list at
+        'pwl_filepath' (the valid spellings and character names)
+    the dictionary file holds only stems, without the forms made by its
+        affixes (e.g., 'looks' or 'eyes'), so if 'dictionary' is provided, the
+        words of 'word_frequencies' (the words of the comics) that it accepts
+        are added, too; if 'known_words' (see 'load_known_words') is provided,
+        the words of 'word_frequencies' in it are added instead, without
+        checking them again
+    '''
+
+    words = read_hunspell_words(dic_filepath)
+    if pwl_filepath is not None:
+        words.extend(read_text_file(pwl_filepath))
+    if known_words is not None and word_frequencies:
+        words.extend(w for w in word_frequencies if w in known_words)
+    elif dictionary is not None and word_frequencies:
+        words.extend(build_known_words(dictionary, words=word_frequencies))
+
+    return(SymSpellSuggester(words, word_frequencies))
+
+
+def build_known_words(dictionary, dic_filepath=None, words=()):
+    '''
+    returns frozenset of lowercase words that 'dictionary' accepts, so that
+        they can be accepted without calling enchant (see
+        'correct_string_misspellings')
+    the candidate words are the lowercase words of the Hunspell dictionary file
+        at 'dic_filepath', if it exists, and 'words', e.g., the valid spellings,
+        character names and the words of the comics
+    each candidate is checked once with 'dictionary', so that the set never
+        accepts a word that enchant would flag
+    '''
+
+    import os
+
+    candidates = {w.lower() for w in words}
+    if dic_filepath is not None and os.path.isfile(dic_filepath):
+        candidates.update(w for w in read_hunspell_words(dic_filepath)
+                          if w == w.lower())
+
+    known_words = frozenset(w for w in candidates if dictionary.check(w))
+
+    return(known_words)
+
+
+class WordSegmenter(object):
+    '''
+    splits run-together tokens, like 'thatSally', 'YAWNCharlie',
+        'CaliforniaLINUS' or 'Snoopylifts', into the words that they are made
+        of:  the words that the 'language' dictionary with the personal word
+        list at 'pwl_filepath' (the valid spellings and character names)
+        accepts
+    a token is first split where its case changes:  before a capital letter
+        that follows a lowercase letter, and before the last capital letter of
+        a capitalized run that is followed by a lowercase letter; a piece of 2
+        or more capital letters may then be any shouted word or sound effect,
+        like 'YAWN' or 'WAAH'
+    a piece that is not a word is split by dynamic programming into the fewest
+        words, preferring longer words; each word must have at least
+        'min_word_length' letters or appear at least 'min_frequency' times in
+        'word_frequencies' (the words of the comics), so that rare short words,
+        like 'woo', do not make splits; only words of up to 'max_word_length'
+        letters are tried at each position, so that the time is linear in the
+        length of the token
+    a piece that is 1 edit away from a word of at least 'min_word_length'
+        letters (e.g., 'Woodstack' or 'Charlies') is taken for a typo rather
+        than a join, and is not split
+    splits are cached per token, because the same joins recur in the comics
+    the segmenter has a 'version' hash of its word sources and parameters, so
+        that corrections that depend on it can be invalidated when they change,
+        but not when other words of the comics change
+    the dictionary is loaded when it is first needed and is not pickled, so
+        that the object can be sent to worker processes
+    '''
+
+    def __init__(self, pwl_filepath, word_frequencies=None, min_word_length=4,
+                 min_frequency=50, max_word_length=20, language='en_US'):
+
+        if word_frequencies is None:
+            word_frequencies = {}
+
+        self.pwl_filepath = pwl_filepath
+        self.language = language
+        self.min_word_length = min_word_length
+        self.max_word_length = max_word_length
+        self.short_words = frozenset(
+            w for w, n in word_frequencies.items()
+            if len(w) < min_word_length and n >= min_frequency)
+        self.dictionary = None
+        self.cache = {}
+        self.version = hash_object([language, compute_file_hash(pwl_filepath),
+                                    sorted(self.short_words), min_word_length,
+                                    min_frequency, max_word_length])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['dictionary'] = None
+        return(state)
+
+    def check(self, word):
+        '''
+        returns 'True' if the dictionary accepts lowercase 'word'
+        '''
+
+        import enchant
+
+        if self.dictionary is None:
+            self.dictionary = enchant.DictWithPWL(self.language,
+                                                  self.pwl_filepath)
+
+        return(self.dictionary.check(word))
+
+    def split_words(self, piece):
+        '''
+        returns list of the words that 'piece' is made of, in its own case, or
+            'None' if it can not be split into words
+        '''
+
+        lower_piece = piece.lower()
+        piece_len = len(piece)
+
+        def is_part(part):
+            if (len(part) < self.min_word_length and
+                    part not in self.short_words):
+                return(False)
+            return(self.check(part))
+
+        # 'best[i]' is the (cost, start of last word) of the best split of the
+        #   first 'i' letters; fewer words cost less and, among splits with as
+        #   many words, longer words cost less
+        best = [None] * (piece_len + 1)
+        best[0] = ((0, 0), None)
+        for i in range(1, piece_len + 1):
+            for j in range(max(0, i - self.max_word_length), i):
+                if best[j] is None or not is_part(lower_piece[j:i]):
+                    continue
+                cost = (best[j][0][0] + 1, best[j][0][1] - (i - j) ** 2)
+                if best[i] is None or cost < best[i][0]:
+                    best[i] = (cost, j)
+
+        if best[piece_len] is None:
+            return(None)
+
+        words = []
+        i = piece_len
+        while i > 0:
+            j = best[i][1]
+            words.append(piece[j:i])
+            i = j
+
+        # a typo of a word can often be split, too, e.g., 'woodstack'
+        if len(words) > 1 and is_one_edit_from_word(
+                lower_piece,
+                lambda w: len(w) >= self.min_word_length and self.check(w)):
+            return(None)
+
+        return(words[::-1])
+
+    def segment(self, token):
+        '''
+        returns list of the words that 'token' is made of, in its own case, or
+            'None' if it is not a join of at least 2 words
+        '''
+
+        import re
+
+        if token in self.cache:
+            return(self.cache[token])
+
+        words = None
+        if token.isalpha():
+            pieces = re.findall('[A-Z]+(?![a-z])|[A-Z]?[a-z]+', token)
+            words = []
+            for piece in pieces:
+                if (self.check(piece.lower()) or
+                        (piece.isupper() and len(piece) > 1 and
+                         len(pieces) > 1)):
+                    words.append(piece)
+                    continue
+                piece_words = self.split_words(piece)
+                if piece_words is None:
+                    words = None
+                    break
+                words.extend(piece_words)
+
+        if words is not None and len(words) < 2:
+            words = None
+
+        self.cache[token] = words
+        return(words)
+
+
+def get_suggestions(word, dictionary, suggestion_cache=None, suggester=None):
+    '''
+    returns spell checker suggestions for 'word', using 'suggestion_cache' if
+        it is provided
+    if 'suggester' (e.g., a 'SymSpellSuggester') is provided, its suggestions
+        are used instead of the dictionary's; a 'suggestion_cache' must then
+        have been created for the 'suggester'
+    '''
+
+    if suggestion_cache is not None:
+        return(suggestion_cache.suggest(word))
+    if suggester is not None:
+        return(suggester.suggest(word))
+    return(dictionary.suggest(word))
+
+
+def is_one_edit_from_word(word, check):
+    '''
+    returns 'True' if deleting, transposing, replacing or inserting one letter
+        of the lowercase 'word' makes a word that 'check' (e.g., the
+        dictionary's 'check') accepts
+    '''
+
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+
+    edits = set()
+    for left, right in splits:
+        if right:
+            edits.add(left + right[1:])
+            edits.update(left + c + right[1:] for c in letters)
+        if len(right) > 1:
+            edits.add(left + right[1] + right[0] + right[2:])
+        edits.update(left + c + right for c in letters)
+    edits.discard(word)
+
+    return(any(check(e) for e in edits if e))
+
+
+def classify_noise_token(word, is_upper=False, check=None):
+    '''
+    returns 'sound_effect' if 'word' looks like a sound effect (e.g.,
+        'MMMMMMMMM', 'ZZZ', 'HEEE'), 'letter_string' if it looks like a string
+        of random letters (e.g., 'VATDHKWXJUFIBLSCNOQGEYR'), and otherwise
+        'None'
+    the spell checker's suggestions for such tokens are slow and seldom right,
+        so flagged tokens that are classified can be left as they are
+    only shouted tokens, written in capital letters ('is_upper'), are
+        classified, because typos in ordinary text (e.g., 'Snooopy' or 'Brwn')
+        look much like noise
+    if 'check' (e.g., the dictionary's 'check') is provided, a token is not
+        noise if it, or the token with its runs of 3 or more of a letter
+        shortened, is 1 edit away from a word of at least 3 letters that
+        'check' accepts (e.g., 'SNOOOOPY' or 'TEH')
+    '''
+
+    import re
+
+    if not is_upper or not word.isalpha():
+        return(None)
+
+    word = word.lower()
+    vowels_len = sum(1 for c in word if c in 'aeiouy')
+    longest_repeat = max(len(m.group()) for m in re.finditer(r'(.)\1*', word))
+    longest_consonants = max(
+        [len(r) for r in re.findall('[^aeiouy]+', word)] + [0])
+
+    # e.g., 'mmmmmm', 'aaaaugh', 'zzz', 'heee':  a long run of a letter, or
+    #   only a few distinct letters
+    if longest_repeat >= 4 or len(set(word)) <= 3:
+        noise = 'sound_effect'
+
+    # e.g., 'vatdhkwxjufiblscnoqgeyr':  a long token with few vowels;
+    #   run-together words, like 'charliebrown', have more
+    elif longest_consonants >= 6 or (len(word) >= 12 and
+                                     vowels_len < 0.3 * len(word)):
+        noise = 'letter_string'
+
+    else:
+        return(None)
+
+    if check is not None:
+        candidates = {word, re.sub(r'(.)\1{2,}', r'\1', word),
+                      re.sub(r'(.)\1{2,}', r'\1\1', word)}
+        if any(len(c) >= 3 and is_one_edit_from_word(
+                c, lambda w: len(w) >= 3 and check(w)) for c in candidates):
+            return(None)
+
+    return(noise)
+
+
+class NoiseClassifier(object):
+    '''
+    classifies flagged tokens with 'classify_noise_token', probing the words
+        around them with 'check' (e.g., the dictionary's 'check')
+    the probes of a token's edits call 'check' hundreds of times, so the result
+        is cached per token and case, because the same sound effects recur in
+        the comics
+    '''
+
+    def __init__(self, check=None):
+
+        self.check = check
+        self.cache = {}
+
+    def classify(self, word, is_upper=False):
+        '''
+        returns the class of 'word' from 'classify_noise_token'
+        '''
+
+        key = (word.lower(), is_upper)
+        if key not in self.cache:
+            self.cache[key] = classify_noise_token(word, is_upper, self.check)
+
+        return(self.cache[key])
+
+
+def explode_panels(rows, keys=None):
+    '''
+    returns long-format table with one row per panel of 'rows', each of which
+        is a list of panels:  the position of its row ('row'), the key of its
+        row from 'keys' ('filename'; only if 'keys' is provided), its position
+        in its row ('panel_index') and its text ('text')
+    '''
+
+    import itertools
+    import numpy as np
+    import pandas as pd
+
+    panels_lens = np.array([len(r) for r in rows], dtype=int)
+    row_positions = np.repeat(np.arange(len(rows)), panels_lens)
+
+    # each panel's position in its row is its position in the long table minus
+    #   the position of the first panel of its row
+    row_starts = np.cumsum(panels_lens) - panels_lens
+    panel_indices = np.arange(panels_lens.sum()) - row_starts[row_positions]
+
+    long_table = pd.DataFrame({'row': row_positions})
+    if keys is not None:
+        long_table['filename'] = np.repeat(np.array(keys, dtype=object),
+                                           panels_lens)
+    long_table['panel_index'] = panel_indices
+    long_table['text'] = list(itertools.chain.from_iterable(rows))
+
+    return(long_table)
+
+
+def regroup_panels(long_column, panels_lens):
+    '''
+    returns list of rows, each of which is a list of panels, from a column of
+        the long-format table from 'explode_panels'; 'panels_lens' holds the
+        number of panels in each row
+    '''
+
+    values = long_column.tolist()
+    rows = []
+    start = 0
+    for panels_len in panels_lens:
+        rows.append(values[start:start + panels_len])
+        start += panels_len
+
+    return(rows)
+
+
+def read_compiled_manifest(manifest_filepath):
+    '''
+    reads manifest written by 'append_compiled_strips'
+    each line of the manifest records a batch of compiled strips and the size
+        of the compiled file after the batch was written
+    returns dictionary that maps each compiled strip's file name to the hash of
+        its panels, and the size in bytes of the compiled file after the last
+        completely recorded batch; a partially written last line, e.g., from a
+        crash, is ignored
+    '''
+
+    import os
+    import json
+
+    compiled_strips = {}
+    output_bytes = 0
+
+    if not os.path.isfile(manifest_filepath):
+        return(compiled_strips, output_bytes)
+
+    with open(manifest_filepath, encoding='utf-8') as manifest_file:
+        for line in manifest_file:
+            try:
+                batch = json.loads(line)
+            except ValueError:
+                break
+            compiled_strips.update(batch['strips'])
+            output_bytes = batch['output_bytes']
+
+    return(compiled_strips, output_bytes)
+
+
+def append_compiled_strips(records, strip_hashes, compiled_filepath,
+                           manifest_filepath, columns):
+    '''
+    appends misspelling 'records' (tuples ordered as 'columns') to the compiled
+        file and then records the compiled strips and their 'strip_hashes' in
+        the manifest
+    the compiled file is written before the manifest, so that the manifest
+        never refers to misspellings that are not on disk
+    '''
+
+    import os
+    import json
+    import pandas as pd
+
+    batch = pd.DataFrame.from_records(records, columns=columns)
+
+    with open(compiled_filepath, 'a', encoding='utf-8') as compiled_file:
+        batch.to_csv(compiled_file, sep='^', index=False, header=False)
+        compiled_file.flush()
+        os.fsync(compiled_file.fileno())
+        output_bytes = compiled_file.tell()
+
+    with open(manifest_filepath, 'a', encoding='utf-8') as manifest_file:
+        manifest_file.write(json.dumps({'output_bytes': output_bytes,
+                                        'strips': strip_hashes}) + '\n')
+        manifest_file.flush()
+        os.fsync(manifest_file.fileno())
+
+
+def reset_compiled_misspellings(compiled, strip_hashes, compiled_filepath,
+                                manifest_filepath, columns):
+    '''
+    rewrites the compiled file with the misspellings in 'compiled' and the
+        manifest with the strips in 'strip_hashes'
+    '''
+
+    import os
+    import pandas as pd
+
+    if compiled is None:
+        compiled = pd.DataFrame(columns=columns)
+
+    compiled.to_csv(compiled_filepath, sep='^', index=False)
+    if os.path.isfile(manifest_filepath):
+        os.remove(manifest_filepath)
+    append_compiled_strips([], strip_hashes, compiled_filepath,
+                           manifest_filepath, columns)
+
+
+def compile_misspellings(table_filepath, force_recompile=False,
+                         suggestion_cache_filepath='suggestion_cache.sqlite',
+                         save_interval=500, suggester='enchant',
+                         dic_filepath='/usr/share/hunspell/en_US.dic',
+                         output_format='csv', compact=False,
+                         skip_noise=False):
+    '''
+    compiles table of misspellings and suggested corrections from spell checker
+        using a U.S. English dictionary
+    suggestions are cached in 'suggestion_cache_filepath'; if it is 'None',
+        suggestions are cached only in memory for the duration of the call
+    the compiled strips ('filename's) are tracked in a manifest along with a
+        hash of their panels and of the options that change their
+        misspellings, so that only new or modified strips are checked;
+        their misspellings are merged into the existing compiled file, and the
+        misspellings of modified or removed strips are dropped from it
+    progress is saved every 'save_interval' strips, so that an interrupted
+        compilation resumes where it stopped
+    if 'force_recompile' is 'True', all strips are checked again
+    if 'suggester' is 'symspell', suggestions come from a 'SymSpellSuggester'
+        built from the dictionary words at 'dic_filepath' and ranked by their
+        frequencies in the table, instead of from enchant
+    if 'output_format' is 'parquet' or 'feather', a copy of the compiled
+        misspellings is also written in that format and is read instead of the
+        'csv' file while nothing has been compiled since
+    if 'compact' is 'True', the compiled misspellings are returned in the
+        normalized form of 'compact_misspellings', and the memory used by both
+        forms is reported
+    if 'skip_noise' is 'True', misspellings that 'classify_noise_token' takes
+        for sound effects or letter strings are compiled without suggestions,
+        so that they are left for review instead of going to the suggester
+    '''
+
+    import os
+    import enchant
+    import pandas as pd
+    from collections import Counter
+    from enchant.checker import SpellChecker
+
+    compiled_filename = 'compiled_misspellings.csv'
+    manifest_filename = 'compiled_misspellings_manifest.jsonl'
+    columns = ['filename', 'panel_index', 'containing_text', 'misspellings',
+               'suggestions']
+
+    compiled_strips, output_bytes = read_compiled_manifest(manifest_filename)
+    if (force_recompile or not os.path.isfile(compiled_filename) or
+            not os.path.isfile(manifest_filename)):
+        compiled_strips = {}
+        reset_compiled_misspellings(None, {}, compiled_filename,
+                                    manifest_filename, columns)
+    else:
+        # discard anything written after the last completely recorded batch
+        with open(compiled_filename, 'r+b') as compiled_file:
+            compiled_file.truncate(output_bytes)
+
+    # the options that change the compiled misspellings are part of each
+    #   strip's hash, so that strips are checked again when they change
+    options_hash = make_options_hash(suggester, dic_filepath, skip_noise)
+
+    table = read_table(table_filepath, 'text_by_panels')
+    table_col = 3
+    keys = [str(k) for k in table.iloc[:, 0]]
+    strip_hashes = {k: hash_object([r, options_hash])
+                    for k, r in zip(keys, table.iloc[:, table_col])}
+
+    # drop misspellings of strips that were modified or removed from the table
+    stale_strips = {k for k in compiled_strips
+                    if strip_hashes.get(k) != compiled_strips[k]}
+    if stale_strips:
+        compiled = read_table(compiled_filename, 'suggestions')
+        compiled = compiled[~compiled['filename'].astype(str).isin(stale_strips)]
+        compiled_strips = {k: h for k, h in compiled_strips.items()
+                           if k not in stale_strips}
+        reset_compiled_misspellings(compiled, compiled_strips,
+                                    compiled_filename, manifest_filename,
+                                    columns)
+
+    strips_to_check = [i for i in range(len(table))
+                       if keys[i] not in compiled_strips]
+    print('Checking {0} of {1} strips; {2} are already compiled'
+          .format(len(strips_to_check), len(table),
+                  len(table) - len(strips_to_check)))
+
+    if strips_to_check:
+        dictionary = enchant.Dict('en_US')
+        #checker = enchant.checker.SpellChecker(dictionary)     # produces error
+        checker = SpellChecker(dictionary)
+
+        if suggester == 'symspell':
+            from enchant.tokenize import get_tokenizer
+            word_frequencies = count_corpus_words(table.iloc[:, table_col],
+                                                  get_tokenizer('en_US'))
+            symspell = build_symspell_suggester(
+                dic_filepath, word_frequencies=word_frequencies,
+                dictionary=dictionary)
+            suggestion_cache = SuggestionCache(
+                symspell, symspell.version, suggestion_cache_filepath)
+        else:
+            suggestion_cache = SuggestionCache(
+                dictionary, cache_filepath=suggestion_cache_filepath)
+
+        # each distinct panel text is checked only once
+        misspellings_by_text = {}
+        noise_counts = Counter()
+        noise_classifier = NoiseClassifier(dictionary.check)
+
+        def suggest(word):
+            if skip_noise:
+                noise = noise_classifier.classify(word, word.isupper())
+                if noise is not None:
+                    noise_counts[noise] += 1
+                    return([])
+            return(get_suggestions(word, dictionary, suggestion_cache))
+
+        for n in range(0, len(strips_to_check), save_interval):
+            batch_indices = strips_to_check[n:n + save_interval]
+            panels = explode_panels(
+                table.iloc[batch_indices, table_col].tolist(),
+                table.iloc[batch_indices, 0].tolist())
+
+            new_texts = [t for t in panels['text'].unique()
+                         if t not in misspellings_by_text]
+            for text in new_texts:
+                checker.set_text(text)
+                misspellings_by_text[text] = [(e.word, suggest(e.word))
+                                              for e in checker]
+
+            # each misspelling is a record ordered as 'columns'
+            batch_texts = panels['text'].unique()
+            misspellings = pd.DataFrame.from_records(
+                [(t, w, s) for t in batch_texts
+                 for w, s in misspellings_by_text[t]],
+                columns=['text', 'misspellings', 'suggestions'])
+            records = panels.merge(misspellings, on='text', how='inner')
+            records = records.rename(columns={'text': 'containing_text'})
+            records = list(records[columns].itertuples(index=False,
+                                                      name=None))
+
+            batch_hashes = {keys[i]: strip_hashes[keys[i]]
+                            for i in batch_indices}
+            append_compiled_strips(records, batch_hashes, compiled_filename,
+                                   manifest_filename, columns)
+
+        suggestion_cache.close()
+        print(suggestion_cache.report())
+        if skip_noise:
+            print(noise_report(noise_counts))
+
+    binary_filename = 'compiled_misspellings.' + output_format
+    if output_format == 'csv':
+        compiled = read_table(compiled_filename, 'suggestions')
+    elif (strips_to_check or stale_strips or
+            not os.path.isfile(binary_filename) or
+            os.path.getmtime(binary_filename) <
+            os.path.getmtime(compiled_filename)):
+        compiled = read_table(compiled_filename, 'suggestions')
+        write_table(compiled, binary_filename)
+    else:
+        compiled = read_table(binary_filename, 'suggestions')
+
+    if compact:
+        compact_compiled = compact_misspellings(compiled)
+        print(compact_memory_report(compiled, compact_compiled))
+        return(compact_compiled)
+
+    return(compiled)
+
+
+def compact_misspellings(compiled):
+    '''
+    returns normalized form of the compiled misspellings table from
+        'compile_misspellings', as a dictionary of:
+        'occurrences', a table of each misspelling's 'filename', 'panel_index'
+            and word ('misspellings'), with categorical 'filename' and
+            'misspellings' columns and the smallest integer type for
+            'panel_index'; the text of the panel is not copied, because it can
+            be looked up in the comics table (see 'expand_misspellings')
+        'suggestions', a series of suggestions indexed by each distinct word,
+            so that they are stored once per word instead of once per
+            occurrence
+    '''
+
+    import pandas as pd
+
+    occurrences = pd.DataFrame({
+        'filename': compiled['filename'].astype(str).astype('category'),
+        'panel_index': pd.to_numeric(compiled['panel_index'],
+                                     downcast='integer'),
+        'misspellings': compiled['misspellings'].astype('category')})
+
+    first_occurrences = compiled.drop_duplicates('misspellings')
+    suggestions = pd.Series(first_occurrences['suggestions'].values,
+                            index=first_occurrences['misspellings'].values)
+
+    compact = {'occurrences': occurrences, 'suggestions': suggestions}
+
+    return(compact)
+
+
+def expand_misspellings(compact, table, text_col_name='text_by_panels'):
+    '''
+    returns the compiled misspellings table with the columns from
+        'compile_misspellings' from its normalized form from
+        'compact_misspellings'
+    the text of each panel is looked up in column 'text_col_name' of the comics
+        'table' by the panel's 'filename' and 'panel_index'
+    '''
+
+    occurrences = compact['occurrences']
+
+    panels = explode_panels(table[text_col_name].tolist(),
+                            table.iloc[:, 0].astype(str).tolist())
+    panels = panels.rename(columns={'text': 'containing_text'})
+
+    expanded = occurrences.astype({'filename': str, 'misspellings': str,
+                                   'panel_index': int})
+    expanded = expanded.merge(panels[['filename', 'panel_index',
+                                      'containing_text']],
+                              on=['filename', 'panel_index'], how='left')
+    expanded['suggestions'] = expanded['misspellings'].map(
+        compact['suggestions'])
+
+    columns = ['filename', 'panel_index', 'containing_text', 'misspellings',
+               'suggestions']
+
+    return(expanded[columns])
+
+
+def deep_memory_size(a_object, seen=None):
+    '''
+    returns the number of bytes used by 'a_object', including the contents of
+        tables, series, arrays, lists, tuples and dictionaries
+    objects that are referred to more than once, like interned strings, are
+        counted only once, unlike in 'DataFrame.memory_usage(deep=True)', which
+        also does not count the contents of lists
+    '''
+
+    import sys
+    import numpy as np
+    import pandas as pd
+
+    # objects are kept in 'seen', so that the 'id' of a temporary object, like
+    #   a column of a table, is not reused by another object
+    if seen is None:
+        seen = {}
+    if id(a_object) in seen:
+        return(0)
+    seen[id(a_object)] = a_object
+
+    if isinstance(a_object, pd.DataFrame):
+        size = deep_memory_size(a_object.index, seen)
+        for column in a_object.columns:
+            size += deep_memory_size(a_object[column], seen)
+    elif isinstance(a_object, pd.Series):
+        size = deep_memory_size(a_object.index, seen)
+        if a_object.dtype == object:
+            size += deep_memory_size(a_object.values, seen)
+        else:
+            # numbers, categories and strings that are not Python objects
+            size += a_object.memory_usage(index=False, deep=True)
+    elif isinstance(a_object, pd.Index):
+        if a_object.dtype == object:
+            size = deep_memory_size(a_object.values, seen)
+        else:
+            size = a_object.memory_usage(deep=True)
+    elif isinstance(a_object, np.ndarray):
+        size = a_object.nbytes
+        if a_object.dtype == object:
+            size += sum(deep_memory_size(e, seen) for e in a_object)
+    elif isinstance(a_object, (list, tuple)):
+        size = sys.getsizeof(a_object)
+        size += sum(deep_memory_size(e, seen) for e in a_object)
+    elif isinstance(a_object, dict):
+        size = sys.getsizeof(a_object)
+        size += sum(deep_memory_size(k, seen) +
+                    deep_memory_size(v, seen)
+                    for k, v in a_object.items())
+    else:
+        size = sys.getsizeof(a_object)
+
+    return(size)
+
+
+def compact_memory_report(compiled, compact):
+    '''
+    returns string comparing the memory used by the compiled misspellings table
+        'compiled' and by its normalized form 'compact'
+    '''
+
+    full_size = deep_memory_size(compiled)
+    compact_size = deep_memory_size(compact)
+
+    report = ('Compiled misspellings: {0} occurrences of {1} distinct words; '
+              '{2:.2f} MB as compiled, {3:.2f} MB compact ({4:.1f}%)'
+              .format(len(compiled), len(compact['suggestions']),
+                      full_size / 1e6, compact_size / 1e6,
+                      100 * compact_size / full_size if full_size else 0))
+
+    return(report)
+
+
+def build_misspelling_index(compiled_filepath='compiled_misspellings.csv',
+                            index_filepath='misspelling_index.sqlite'):
+    '''
+    builds an inverted index of the compiled misspellings at
+        'compiled_filepath' from 'compile_misspellings' in the SQLite file at
+        'index_filepath', unless the index was already built from the same
+        compiled file, and returns it as a 'MisspellingIndex'
+    the index holds, for each distinct misspelled word, its number of
+        occurrences, its rank in the review queue (most frequent words first)
+        and its suggestions; for each word and panel, the number of occurrences;
+        and the text of each panel that has a misspelling, stored only once
+    '''
+
+    import os
+    import json
+    import sqlite3
+
+    compiled_hash = compute_file_hash(compiled_filepath)
+
+    if os.path.isfile(index_filepath):
+        index = MisspellingIndex(index_filepath)
+        if index.compiled_hash == compiled_hash:
+            return(index)
+        index.close()
+
+    compiled = read_table(compiled_filepath, 'suggestions')
+    compiled['filename'] = compiled['filename'].astype(str)
+
+    word_counts = (compiled.groupby('misspellings').size()
+                   .reset_index(name='count'))
+    word_counts = word_counts.sort_values(['count', 'misspellings'],
+                                          ascending=[False, True])
+    suggestions = (compiled.drop_duplicates('misspellings')
+                   .set_index('misspellings')['suggestions'])
+    words = [(w, rank, c, json.dumps(suggestions[w]))
+             for rank, (w, c) in enumerate(zip(
+                 word_counts['misspellings'].tolist(),
+                 word_counts['count'].tolist()))]
+
+    occurrences = (compiled.groupby(['misspellings', 'filename', 'panel_index'])
+                   .size().reset_index(name='count'))
+    panels = compiled.drop_duplicates(['filename', 'panel_index'])
+
+    # build in temporary file, so that an interrupted build leaves no index
+    temporary_filepath = index_filepath + '.partial'
+    if os.path.isfile(temporary_filepath):
+        os.remove(temporary_filepath)
+
+    connection = sqlite3.connect(temporary_filepath)
+    connection.execute('CREATE TABLE metadata (key TEXT PRIMARY KEY, '
+                       'value TEXT)')
+    connection.execute('CREATE TABLE words (word TEXT PRIMARY KEY, '
+                       'rank INTEGER UNIQUE, count INTEGER, suggestions TEXT)')
+    connection.execute('CREATE TABLE occurrences (word TEXT, filename TEXT, '
+                       'panel_index INTEGER, count INTEGER, '
+                       'PRIMARY KEY (word, filename, panel_index))')
+    connection.execute('CREATE TABLE panels (filename TEXT, '
+                       'panel_index INTEGER, text TEXT, '
+                       'PRIMARY KEY (filename, panel_index))')
+
+    connection.execute('INSERT INTO metadata VALUES (?, ?)',
+                       ('compiled_hash', compiled_hash))
+    connection.executemany('INSERT INTO words VALUES (?, ?, ?, ?)', words)
+    connection.executemany(
+        'INSERT INTO occurrences VALUES (?, ?, ?, ?)',
+        zip(occurrences['misspellings'].tolist(),
+            occurrences['filename'].tolist(),
+            occurrences['panel_index'].tolist(),
+            occurrences['count'].tolist()))
+    connection.executemany(
+        'INSERT INTO panels VALUES (?, ?, ?)',
+        zip(panels['filename'].tolist(), panels['panel_index'].tolist(),
+            panels['containing_text'].tolist()))
+    connection.commit()
+    connection.close()
+
+    os.replace(temporary_filepath, index_filepath)
+
+    return(MisspellingIndex(index_filepath))
+
+
+class MisspellingIndex(object):
+    '''
+    queries the inverted index of misspellings built by
+        'build_misspelling_index' for the manual review of misspellings (see
+        'make_valid_spellings_list')
+    each query reads only the rows it needs through the index's primary keys,
+        so that looking up a word or a page of the review queue does not scan
+        the compiled misspellings
+    '''
+
+    def __init__(self, index_filepath='misspelling_index.sqlite'):
+
+        import sqlite3
+
+        self.connection = sqlite3.connect(index_filepath)
+        row = self.connection.execute(
+            'SELECT value FROM metadata WHERE key = ?',
+            ('compiled_hash',)).fetchone()
+        self.compiled_hash = row[0] if row else None
+
+    def __len__(self):
+        return(self.connection.execute(
+            'SELECT COUNT(*) FROM words').fetchone()[0])
+
+    def review_queue(self, start=0, size=50):
+        '''
+        returns list of (rank, word, count) of the misspelled words with ranks
+            'start' to 'start' + 'size' - 1, from most to least frequent
+        '''
+
+        rows = self.connection.execute(
+            'SELECT rank, word, count FROM words '
+            'WHERE rank >= ? AND rank < ? ORDER BY rank',
+            (start, start + size)).fetchall()
+
+        return(rows)
+
+    def word_info(self, word):
+        '''
+        returns dictionary with the 'rank', 'count' and 'suggestions' of 'word',
+            or 'None' if it is not a compiled misspelling
+        '''
+
+        import json
+
+        row = self.connection.execute(
+            'SELECT rank, count, suggestions FROM words WHERE word = ?',
+            (word,)).fetchone()
+        if row is None:
+            return(None)
+
+        return({'rank': row[0], 'count': row[1],
+                'suggestions': json.loads(row[2])})
+
+    def lookup(self, word):
+        '''
+        returns list of (filename, panel_index, count, text) of the panels in
+            which 'word' is misspelled
+        '''
+
+        rows = self.connection.execute(
+            'SELECT o.filename, o.panel_index, o.count, p.text '
+            'FROM occurrences AS o JOIN panels AS p '
+            'ON o.filename = p.filename AND o.panel_index = p.panel_index '
+            'WHERE o.word = ? ORDER BY o.filename, o.panel_index',
+            (word,)).fetchall()
+
+        return(rows)
+
+    def print_context(self, word, max_panels=None):
+        '''
+        prints the suggestions for 'word' and the panels in which it is
+            misspelled for visual inspection
+        '''
+
+        info = self.word_info(word)
+        if info is None:
+            print('{0} is not a compiled misspelling'.format(word))
+            return()
+
+        print('{0}:  rank {1}, {2} occurrences, suggestions {3}'
+              .format(word, info['rank'], info['count'], info['suggestions']))
+        for filename, panel_index, count, text in self.lookup(word)[:max_panels]:
+            print('{0} panel {1} ({2}x):  {3}'
+                  .format(filename, panel_index, count, text))
+        print('\n')
+
+    def close(self):
+        self.connection.close()
+
+
+def print_df_strings(a_dataframe, search_string, search_column, show_column):
+    '''
+    prints strings from a dataframe for visual inspection
+    '''
+
+    for i in range(len(a_dataframe)):
+        #if search_string in a_dataframe.iloc[i, search_column]:
+        if search_string == a_dataframe.iloc[i, search_column]:
+            print(search_string)
+            print(a_dataframe.iloc[i, show_column])
+            print('\n')
+
+
+def write_list_to_text_file(a_list, text_file_name, overwrite_or_append = 'a'):
+    '''
+    writes a list of strings to a text file
+    appends by default; change to overwriting by setting to 'w' instead of 'a'
+    '''
+
+    try:
+        textfile = open(text_file_name, overwrite_or_append, encoding = 'utf-8')
+        for element in a_list:
+            textfile.write(element)
+            textfile.write('\n')
+
+    finally:
+        textfile.close()
+
+
+def read_text_file(text_filename, as_string=False):
+    '''
+    reads each line in a text file as a list item and returns list by default
+    if 'as_string' is 'True', reads entire text file as a single string
+    '''
+
+    text_list = []
+
+    try:
+        with open(text_filename) as text:
+            if as_string:
+                # reads text file as single string
+                text_list = text.read().replace('\n', '')
+            else:
+                # reads each line of text file as item in a list
+                for line in text:
+                    text_list.append(line.rstrip('\n'))
+            text.close()
+        return(text_list)
+
+    except:
+        return('There was an error while trying to read the file')
+
+
+def make_valid_spellings_list(misspell_table, return_list=True):
+    '''
+    sets up and documents process for manually viewing and editing
+        'misspell_table' into a 'valid_spell_list' that provides a customized
+        list of words that the spell checker will accept
+    the original list of misspellings, from an initial run of the spell checker,
+        found 3743 misspellings
+    in editing the text file of the list, I scrutinized frequent misspellings
+        closely, which included reading the original context and sometimes
+        referring to the comic itself
+    less frequent misspellings were reviewed more quickly with special attention
+        for possible character names; generally for these less frequent words, I
+        removed them (thereby letting the next run of the spell checker change
+        them) only if I was quite confident that the misspelling didn't
+        accurately transcribe the comic and that the spell checker would pick
+        the correct substitute
+    I included some notes as comments below on my choices; the notes include a
+        category of 'words that are retained and are not corrected by 1st
+        checker option', which will require customized attention to correct
+    if 'return_list' is 'True', the edited list is read from its text file and
+        returned
+    '''
+
+    # counts of how many times each misspelled word occurs
+    #misspell_counts = misspell_table['misspellings'].value_counts()
+    #misspell_count_list = list(misspell_counts.keys())
+
+    # create files of the original and edited word lists
+    original_list_file = 'misspell_list.txt'
+    valid_spell_list_file = 'valid_spell_list.txt'
+    write_list_to_text_file(original_list_file, original_list_file, 'w')
+    # WARNING:  The line below will overwrite the manually edited file
+    #write_list_to_text_file(original_list_file, valid_spell_list_file, 'w')
+
+    '''
+    # view words manually and interactively to determine whether to retain them
+    word = 'Saslly'
+    i = misspell_count_list.index(word)
+    print_df_strings(misspell_table, list(misspell_count_list)[i], 3, 2)
+    print_df_strings(misspell_table, list(misspell_count_list)[i], 3, 4)
+    print_df_strings(misspell_table, list(misspell_count_list)[i], 3, 0)
+
+    # the same review through the inverted index, without scanning the table
+    misspell_index = build_misspelling_index()
+    for rank, word, count in misspell_index.review_queue(0, 50):
+        misspell_index.print_context(word)
+    '''
+
+    # NOTES ON MANUAL EDITING PROCESS
+    #
+    #
+    # words that are retained:
+    #
+    # "'im", which is accurately transcribed and is short for "him"
+    # "ve", which is part of "I've"
+    # "de" is from French dialogue
+    # "da" is from singing
+    # 'ka', which is an accurate transcription of Snoopy's thought
+    # "te" is from singing
+    # "dum" is from singing
+    # 'goodby' accurately transcribes the comic
+    # 'Il' is from French dialogue
+    # 'VATDHKWXJUFIBLSCNOQGEYR' accurately transcribes the comic
+    #
+    #
+    # words that are retained and are not corrected by 1st checker option:
+    #
+    # an 'i' with a squiggly mark over it; should be an apostrophe
+    # "say's" misspells 'says'; spell checker option #3 corrects it
+    # 'Charie' misspells 'Charlie'; spell checker option #2 corrects it
+    # 'Salley' misspells 'Sally'; spell checker option #2 corrects it
+    # 'loks' misspells 'looks'; spell checker option #2 corrects it
+    # 'Beaglscout' misspells 'Beaglescout'; spell checker doesn't correct it
+    # 'Bown' misspells 'Brown'; spell checker option #3 corrects it
+    # 'Lius' misspells 'Linus'; spell checker option #3 corrects it
+    # 'eys' misspells 'eyes'; spell checker option #4 corrects it
+    # 'ozzes' misspells 'ounces'; spell checker doesn't correct it
+    # 'Charlei' misspells 'Charlie'; spell checker option #2 corrects it
+    # 'Linu' misspells 'Linus'; spell checker option #2 corrects it
+    # 'disterbense' misspells 'disturbance'; I haven't checked the comic
+    # 'Luc' misspells 'Lucy'; spell checker option #5 corrects it
+    # 'Vioet' misspells 'Violet'; spell checker option #2 corrects it
+    # 'hom' misspells 'home'; spell checker option #7 corrects it
+    # 'son't' misspells 'don't'; spell checker option #2 corrects it
+    # 'blandet' misspells 'blanket'; spell checker option #3 corrects it
+    # 'mit' misspells 'mitt' in one comic but is correct German in another
+    # 'Charle' misspells 'Charlie'; spell checker option #2 corrects it
+    # 'Salluy' misspells 'Sally'; spell checker option #2 corrects it
+    # 'ZSNOOPY' misspells 'Z SNOOPY'; spell checker option #2 corrects it
+    # 'legionaires' misspells 'legionnaires'; spell checker option #2 corrects it
+    # 'Patrcia' misspells 'Patricia'; spell checker option #2 corrects it
+    # 'Suppertie' misspells 'Suppertime'; spell checker doesn't correct it
+    # 'Barown' misspells 'Brown'; spell checker option #2 corrects it
+    # 'bBrown' misspells 'Brown'; spell checker option #3 corrects it
+    # 'Brownas' misspells 'Brown as'; spell checker option #2 corrects it
+    # 'ZBrown' misspells 'Brown'; spell checker option #2 corrects it
+    # 'Woodst' misspells 'Woodstock'; spell checker doesn't correct it
+    # 'Beagscout' misspells 'Beaglescout'; spell checker doesn't correct it
+    # 'ZZMarcie' misspells 'ZZ Marcie'; spell checker doesn't correct it
+    # 'Paty' misspells 'Patty'; spell checker option #3 corrects it
+    # 'Reun' misspells 'Rerun'; spell checker option #5 corrects it
+    # 'Bhown' misspells 'Brown'; spell checker option #2 corrects it
+    # 'Lcy' misspells 'Lucy'; spell checker option #3 corrects it
+    # 'Saly' misspells 'Sally'; spell checker option #4 corrects it
+    # 'Charli' misspells 'Charlie'; spell checker option #2 corrects it
+    # 'Mrcie' misspells 'Marcie'; spell checker option #2 corrects it
+    # 'VBrown' misspells 'Brown'; spell checker option #2 corrects it
+    # 'Beeth' misspells 'Beethoven'; spell checker option #2 corrects it
+    # 'Cameroun' misspells 'Cameroon'; spell checker option #2 corrects it
+    # 'Pepperiment' misspells 'Peppermint'; spell checker option #3 corrects it
+    # 'Sallu' misspells 'Sally'; spell checker option #4 corrects it
+    # 'Flinstone' misspells 'Flintstone'; spell checker doesn't correct it
+    # 'Marce' misspells 'Marcie'; spell checker option #4 corrects it
+    # 'Rereun's' misspells 'Rerun's'; spell checker option #4 corrects it
+    # 'Lcu' misspells 'Lucy'; spell checker option doesn't correct it
+    # 'Patt' misspells 'Patty'; spell checker option doesn't correct it
+    # 'blockhed' misspells 'blockhead'; spell checker option option #2 corrects it
+    # 'Serman' misspells 'Shermy'; spell checker option doesn't correct it
+    # 'Barown' misspells 'Brown'; spell checker option #2 corrects it
+    # 'skake' misspells 'skate'; spell checker option #2 corrects it
+    #
+    #
+    # words that are not retained and are corrected by 1st checker option:
+    #
+    # originally, I relied on the spell checker to correct these, but in
+    # validation/quality checking, I noticed a case where 'Snooey' was changed
+    # to 'snoot' instead of 'Snoopy'; this called into question how consistently
+    # the checker handles all these cases below, so I've moved them to the
+    # customized dictionary in 'custom_corrections' to be safe
+    #
+    # 'Shroeder' misspells 'Schroeder'; spell checker corrects it
+    # 'CHarlie' misspells 'Charlie'; spell checker corrects it
+    # 'SNoopy' misspells 'Snoopy'; spell checker corrects it
+    # 'Chalrie' misspells 'Charlie'; spell checker corrects it
+    # 'Schroder' misspells 'Schroeder'; spell checker corrects it
+    #
+    # 'Chrlie' misspells 'Charlie'; spell checker corrects it
+    # 'Charllie' misspells 'Charlie'; spell checker corrects it
+    # 'Chrarlie' misspells 'Charlie'; spell checker corrects it
+    # 'Charliee' misspells 'Charlie'; spell checker corrects it
+    # 'TCharlie' misspells 'Charlie'; spell checker corrects it
+    # 'Chralie' misspells 'Charlie'; spell checker corrects it
+    # 'Cahrlie' misspells 'Charlie'; spell checker corrects it
+    # 'Charlies' misspells 'Charlie'; spell checker corrects it
     # 'Chalres' misspells 'Charlie'; spell checker corrects it
     # 'Borwn' misspells 'Brown'; spell checker corrects it
     # 'Bronw' misspells 'Brown'; spell checker corrects it
@@ -570,50 +2012,1905 @@ def custom_corrections():
     return(corrections)
 
 
-def replace_substring(a_string, original_str, replacement_str):
+def song_syllables():
+    '''
+    creates list of syllables that are sung in the comics (e.g., 'da', 'te',
+        'dum') and that the standard English dictionary does not accept
+    '''
+    syllables = ['da', 'dah', 'de', 'dee', 'di', 'doo', 'doop', 'dum', 'fa',
+                 'fol', 'la', 'lah', 'mi', 'nonny', 'rol', 'sol', 'ta', 'te',
+                 'ti', 'tra', 'tum']
+    return(syllables)
+
+
+class SecondaryDictionaries(object):
+    '''
+    accepts words that the U.S. English dictionary flags but that are correct
+        in other 'languages' (e.g., French 'Il' or German 'mit') or are sung
+        'syllables' (e.g., 'da' or 'dum'; see 'song_syllables')
+    each enchant dictionary is loaded only when it is first needed, and
+        languages that are not installed are skipped with a warning
+    the result for each word is cached, so that each word costs at most one
+        check per language, however often it appears
+    the loaded dictionaries are not pickled, so that the object can be sent
+        to worker processes, which load them again when needed
+    the 'version' hash includes which of the 'languages' are installed, so
+        that results from before a dictionary was installed are not reused
+    '''
+
+    def __init__(self, languages=('fr_FR', 'de_DE'), syllables=None):
+
+        import enchant
+
+        if syllables is None:
+            syllables = song_syllables()
+
+        self.languages = list(languages)
+        self.installed = [l for l in self.languages if enchant.dict_exists(l)]
+        for language in self.languages:
+            if language not in self.installed:
+                print('Secondary dictionary {0} is not installed; skipping it'
+                      .format(language))
+        self.syllables = frozenset(w.lower() for w in syllables)
+        self.dictionaries = {}
+        self.cache = {}
+        self.version = hash_object([self.languages, self.installed,
+                                    sorted(self.syllables)])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['dictionaries'] = {}
+        return(state)
+
+    def get_dictionary(self, language):
+        '''
+        returns the enchant dictionary for 'language', loading it on first use,
+            or 'None' if it is not installed
+        '''
+
+        import enchant
+
+        if language not in self.dictionaries:
+            dictionary = None
+            if language in self.installed:
+                dictionary = enchant.Dict(language)
+            self.dictionaries[language] = dictionary
+
+        return(self.dictionaries[language])
+
+    def check(self, word):
+        '''
+        returns the source that accepts 'word', 'song' or a language, or
+            'None' if none accepts it
+        '''
+
+        if word in self.cache:
+            return(self.cache[word])
+
+        source = None
+        if word.lower() in self.syllables:
+            source = 'song'
+        else:
+            for language in self.languages:
+                dictionary = self.get_dictionary(language)
+                if dictionary is not None and dictionary.check(word):
+                    source = language
+                    break
+
+        self.cache[word] = source
+        return(source)
+
+
+def compile_corrections(corrections_dict):
+    '''
+    compiles 'corrections_dict' (e.g., from 'custom_corrections') into a
+        token-keyed lookup table for 'apply_custom_corrections'
+    the table is meant to be built once at startup; entries that would replace
+        a word with itself are dropped, so that they cost nothing per panel
+    '''
+
+    compiled = {k: v for k, v in corrections_dict.items() if k != v}
+    return(compiled)
+
+
+def rewrite_token_spans(a_string, replacements):
+    '''
+    replaces tokens in 'a_string' in a single pass
+    'replacements' is a sequence of (word, offset, replacement) tuples, ordered
+        by 'offset', such as the (word, offset) pairs from the tokenizer or the
+        spell checker with a replacement for each; 'word' is the token that
+        starts at 'offset' in 'a_string'
+    only the whole token at each offset is replaced, and the string is joined
+        once, regardless of the number of replacements
+    '''
+
+    pieces = []
+    last_end = 0
+
+    for word, offset, replacement in replacements:
+        end = offset + len(word)
+        if offset < last_end or a_string[offset:end] != word:
+            raise ValueError('{0!r} is not a token at offset {1} of {2!r}'
+                             .format(word, offset, a_string))
+        pieces.append(a_string[last_end:offset])
+        pieces.append(replacement)
+        last_end = end
+
+    if not pieces:
+        return(a_string)
+
+    pieces.append(a_string[last_end:])
+    return(''.join(pieces))
+
+
+def apply_custom_corrections(a_string, corrections_dict, tokenizer):
+    '''
+    applies all customized corrections in 'corrections_dict' to 'a_string' in a
+        single left-to-right pass over the tokens of 'a_string'
+    only whole tokens are replaced, so a key that happens to be a substring of
+        another word (e.g., 'Luc' in 'Lucy') leaves that word untouched
+    '''
+
+    replacements = [(w, p, corrections_dict[w]) for w, p in tokenizer(a_string)
+                    if w in corrections_dict]
+    return(rewrite_token_spans(a_string, replacements))
+
+
+def correct_string_misspellings(a_string, corrections_dict, character_names,
+                                dictionary, checker, tokenizer,
+                                suggestion_cache=None, counters=None,
+                                timings=None, suggester=None,
+                                known_words=None, panel_memo=None,
+                                noise_classifier=None, segmenter=None,
+                                secondary_dictionaries=None):
+    '''
+    Given 'a_string', returns a spelling-corrected 'a_string'
+    Corrections customized for descriptions of Peanuts comics are applied first,
+        then a standard English dictionary is used for corrections
+    If 'suggestion_cache' is provided, the dictionary's suggestions are looked
+        up through it
+    If 'suggester' is provided, it replaces the dictionary's suggestions (see
+        'get_suggestions')
+    If 'known_words' (see 'build_known_words') is provided, words in it are
+        accepted without calling enchant, and only the other words are checked
+        by the dictionary
+    If 'panel_memo' (a 'PanelMemo') is provided, a string that was corrected
+        before is returned from it, and other strings are added to it
+    If 'noise_classifier' (a 'NoiseClassifier') is provided, flagged words that
+        it takes for sound effects or letter strings are left as they are,
+        without asking for suggestions
+    If 'segmenter' (a 'WordSegmenter') is provided, flagged words that it splits
+        into several words are replaced by those words, without asking for
+        suggestions
+    If 'secondary_dictionaries' (a 'SecondaryDictionaries') is provided, flagged
+        words that it accepts are left as they are; it is consulted before the
+        noise classifier and the segmenter
+    If 'counters' (a 'collections.Counter') is provided, the number of words
+        flagged by the spell checker is added to its 'checker_errors' count;
+        with 'known_words', the numbers of words and of words accepted by
+        'known_words' are added to its 'tokens' and 'tokens_prefiltered' counts;
+        with 'noise_classifier', the number of words left as noise is added to its
+        'noise_sound_effect' or 'noise_letter_string' count; with 'segmenter',
+        the number of words split is added to its 'segmented' count; with
+        'secondary_dictionaries', the number of words accepted by each source
+        is added to its 'secondary_' count for that source (e.g.,
+        'secondary_fr_FR')
+    If 'timings' (a 'collections.Counter') is provided, the seconds spent on
+        customized corrections, the spell checker's check, and its suggestions
+        are added to it
+    '''
+
+    import time
+    from collections import Counter
+
+    if panel_memo is not None:
+        memoized = panel_memo.get(a_string)
+        if memoized is not None:
+            if counters is not None:
+                counters['checker_errors'] += memoized[1]
+                counters.update(memoized[2])
+            return(memoized[0])
+
+    original_string = a_string
+    errors_len = 0
+    # flagged words resolved without suggestions, which are memoized with the
+    #   panel
+    resolved_counts = Counter()
+
+    # customized corrections
+    start_time = time.perf_counter()
+    a_string = apply_custom_corrections(a_string, corrections_dict, tokenizer)
+    cased_string = a_string
+    a_string = a_string.lower()
+
+    def resolve_without_suggest(word, offset):
+        # returns the replacement of a flagged word that needs no suggestions:
+        #   the word itself if it is noise, or the words that it is made of;
+        #   returns 'None' if it needs suggestions
+        # the words are checked in lowercase, so the flagged word in its own
+        #   case is taken from its 'offset' in the cased string
+        if secondary_dictionaries is not None:
+            source = secondary_dictionaries.check(word)
+            if source is not None:
+                resolved_counts['secondary_' + source] += 1
+                return(word)
+        if noise_classifier is None and segmenter is None:
+            return(None)
+        cased_word = cased_string[offset:offset + len(word)]
+        if cased_word.lower() != word:
+            cased_word = word
+        if noise_classifier is not None:
+            noise = noise_classifier.classify(word, cased_word.isupper())
+            if noise is not None:
+                resolved_counts['noise_' + noise] += 1
+                return(word)
+        if segmenter is not None:
+            words = segmenter.segment(cased_word)
+            if words is not None:
+                resolved_counts['segmented'] += 1
+                return(' '.join(words).lower())
+        return(None)
+
+    # correct string according to spell check with full English dictionary
+    # the checker replaces each error in its own buffer and continues after the
+    #   replacement, so the string is scanned only once
+    check_start_time = time.perf_counter()
+    suggest_time = 0
+
+    if known_words is None:
+        # the checker's positions are in its own buffer, which is longer or
+        #   shorter than the string by the replacements made so far
+        shift = 0
+        checker.set_text(a_string)
+        for e in checker:
+            errors_len += 1
+            word = e.word
+            resolved = resolve_without_suggest(word, e.wordpos - shift)
+            if resolved is None:
+                suggest_start_time = time.perf_counter()
+                suggestions = get_suggestions(word, dictionary,
+                                              suggestion_cache, suggester)
+                suggest_time += time.perf_counter() - suggest_start_time
+                if suggestions:
+                    # spell check dictionary capitalizes some words
+                    resolved = suggestions[0].lower()
+            if resolved is not None and resolved != word:
+                e.replace(resolved)
+                shift += len(resolved) - len(word)
+        a_string = checker.get_text()
+
+    else:
+        # same tokens and replacements as the checker, which uses the same
+        #   tokenizer and does not check its replacements again
+        tokens_len = 0
+        prefiltered_len = 0
+        replacements = []
+        for word, offset in tokenizer(a_string):
+            tokens_len += 1
+            if word in known_words:
+                prefiltered_len += 1
+                continue
+            if dictionary.check(word):
+                continue
+            errors_len += 1
+            resolved = resolve_without_suggest(word, offset)
+            if resolved is not None:
+                if resolved != word:
+                    replacements.append((word, offset, resolved))
+                continue
+            suggest_start_time = time.perf_counter()
+            suggestions = get_suggestions(word, dictionary, suggestion_cache,
+                                          suggester)
+            suggest_time += time.perf_counter() - suggest_start_time
+            if suggestions:
+                replacements.append((word, offset, suggestions[0].lower()))
+        a_string = rewrite_token_spans(a_string, replacements)
+
+        if counters is not None:
+            counters['tokens'] += tokens_len
+            counters['tokens_prefiltered'] += prefiltered_len
+
+    if counters is not None:
+        counters['checker_errors'] += errors_len
+        counters.update(resolved_counts)
+
+    end_time = time.perf_counter()
+    if timings is not None:
+        check_time = end_time - check_start_time - suggest_time
+        timings['custom_corrections'] += check_start_time - start_time
+        timings['enchant_check'] += check_time
+        timings['suggest'] += suggest_time
+
+    if panel_memo is not None:
+        panel_memo.put(original_string, a_string, errors_len,
+                       end_time - start_time, resolved_counts)
+
+    return(a_string)
+
+
+class StageTimer(object):
+    '''
+    context manager that adds the elapsed seconds of its block to
+        'timings[stage]'; does nothing if 'timings' is 'None'
+    '''
+
+    def __init__(self, timings, stage):
+        self.timings = timings
+        self.stage = stage
+
+    def __enter__(self):
+        import time
+        self.start_time = time.perf_counter()
+        return(self)
+
+    def __exit__(self, *exc_info):
+        import time
+        if self.timings is not None:
+            elapsed = time.perf_counter() - self.start_time
+            self.timings[self.stage] = (self.timings.get(self.stage, 0) +
+                                        elapsed)
+
+
+def make_run_stats():
+    '''
+    returns empty run statistics: counters, seconds per stage, per-panel
+        latencies in seconds, suggestion cache and panel memo counts, and the
+        waits and queue depths of a staged pipeline
+    '''
+
+    from collections import Counter
+
+    stats = {'counters': Counter(),
+             'timings': Counter(),
+             'latencies': [],
+             'cache': Counter({'memory_hits': 0, 'disk_hits': 0,
+                               'misses': 0}),
+             'panel_memo': Counter(),
+             'pipeline': Counter()}
+    return(stats)
+
+
+def merge_run_stats(stats, other_stats):
+    '''
+    adds 'other_stats' (e.g., from a worker process) to 'stats'
+    '''
+
+    stats['counters'].update(other_stats['counters'])
+    stats['timings'].update(other_stats['timings'])
+    stats['latencies'].extend(other_stats['latencies'])
+    stats['cache'].update(other_stats['cache'])
+    stats['panel_memo'].update(other_stats['panel_memo'])
+
+
+def noise_report(counts):
+    '''
+    returns string summarizing the flagged words that were left as sound effects
+        or letter strings (see 'classify_noise_token'), from 'counts' with
+        'sound_effect' and 'letter_string' or 'noise_sound_effect' and
+        'noise_letter_string' keys
+    '''
+
+    sound_effects = counts['sound_effect'] + counts['noise_sound_effect']
+    letter_strings = counts['letter_string'] + counts['noise_letter_string']
+
+    report = ('Noise tokens: {0} suggest calls avoided ({1} sound effects, '
+              '{2} letter strings)'
+              .format(sound_effects + letter_strings, sound_effects,
+                      letter_strings))
+    return(report)
+
+
+def percentile(sorted_values, fraction):
+    '''
+    returns the value at 'fraction' (between 0 and 1) of 'sorted_values', using
+        the nearest-rank method; returns 0 for an empty list
+    '''
+
+    import math
+
+    if not sorted_values:
+        return(0)
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return(sorted_values[rank - 1])
+
+
+def run_stats_report(stats, elapsed_time):
+    '''
+    returns string with the per-stage breakdown, throughput, per-panel latency
+        and suggestion cache counts of a run that took 'elapsed_time' seconds
+    with several worker processes, stage times are summed over the workers and
+        can therefore exceed the elapsed time
+    '''
+
+    counters = stats['counters']
+    timings = stats['timings']
+    latencies = sorted(stats['latencies'])
+    stage_total = sum(timings.values())
+
+    lines = ['Stage timings:']
+    for stage, seconds in sorted(timings.items(), key=lambda t: -t[1]):
+        share = 100 * seconds / stage_total if stage_total else 0
+        lines.append('  {0:<24} {1:9.3f} s {2:6.1f}%'
+                     .format(stage, seconds, share))
+    lines.append('  {0:<24} {1:9.3f} s'.format('elapsed', elapsed_time))
+
+    rate = 0
+    if elapsed_time:
+        rate = 1 / elapsed_time
+    lines.append('Rows: {0} corrected, {1} skipped, {2:,.1f} rows/s'
+                 .format(counters['rows'], counters['rows_skipped'],
+                         counters['rows'] * rate))
+    lines.append('Panels: {0} corrected, {1:,.1f} panels/s, {2} words flagged'
+                 .format(counters['panels'], counters['panels'] * rate,
+                         counters['checker_errors']))
+    lines.append('Per-panel latency: p50 {0:.3f} ms, p99 {1:.3f} ms, '
+                 'max {2:.3f} ms'
+                 .format(1000 * percentile(latencies, 0.5),
+                         1000 * percentile(latencies, 0.99),
+                         1000 * percentile(latencies, 1)))
+    if counters['tokens']:
+        lines.append('Known-word prefilter: {0} of {1} words ({2:.1f}%) '
+                     'accepted without enchant'
+                     .format(counters['tokens_prefiltered'], counters['tokens'],
+                             100 * counters['tokens_prefiltered'] /
+                             counters['tokens']))
+    if counters['noise_sound_effect'] or counters['noise_letter_string']:
+        lines.append(noise_report(counters))
+    secondary_counts = {k[len('secondary_'):]: v for k, v in counters.items()
+                        if k.startswith('secondary_') and v}
+    if secondary_counts:
+        lines.append('Secondary dictionaries: {0} flagged words accepted ({1})'
+                     .format(sum(secondary_counts.values()), ', '.join(
+                         '{0}: {1}'.format(k, v)
+                         for k, v in sorted(secondary_counts.items()))))
+    if counters['segmented']:
+        lines.append('Segmentation: {0} run-together words split without '
+                     'suggest'.format(counters['segmented']))
+    lines.append(suggestion_cache_report(stats['cache']))
+    if stats['panel_memo']:
+        lines.append(panel_memo_report(stats['panel_memo']))
+    if stats['pipeline']:
+        lines.append(pipeline_report(stats['pipeline']))
+
+    return('\n'.join(lines))
+
+
+def make_personal_word_list(valid_spell_list_file, character_names_file,
+                            pwl_filepath):
+    '''
+    writes the lowercased valid spellings and character names to the personal
+        word list (PWL) file at 'pwl_filepath' for the spell checker
+    returns the list of lowercased character names
+    '''
+
+    valid_words = read_text_file(valid_spell_list_file)
+    valid_words = [s.lower() for s in valid_words]
+
+    character_names = read_text_file(character_names_file)
+    character_names = [s.lower() for s in character_names]
+
+    valid_words.extend(character_names)
+    write_list_to_text_file(valid_words, pwl_filepath, 'w')
+
+    return(character_names)
+
+
+def load_dictionary_artifact(valid_spell_list_file, character_names_file,
+                             pwl_filepath,
+                             artifact_filepath='dictionary_artifact.pickle'):
+    '''
+    returns the valid spellings (a frozenset of lowercased words, including the
+        character names), the lowercased character names and the compiled
+        customized corrections as a dictionary
+    they are built once into a pickled artifact that is stamped with the hashes
+        of their sources:  the valid spellings and character names files and
+        this module, which holds the customized corrections
+    the artifact is loaded instead of rebuilt until a source changes; the
+        personal word list (PWL) file at 'pwl_filepath' is also rewritten only
+        then (or if it is missing or was modified), so that enchant and the
+        suggestion cache see an unchanged file from run to run
+    '''
+
+    import os
+    import pickle
+
+    artifact_version = 1
+    sources = {'version': artifact_version,
+               'valid_spell_list': compute_file_hash(valid_spell_list_file),
+               'character_names': compute_file_hash(character_names_file),
+               'module': compute_file_hash(os.path.abspath(__file__))}
+
+    artifact = None
+    if os.path.isfile(artifact_filepath):
+        try:
+            with open(artifact_filepath, 'rb') as artifact_file:
+                artifact = pickle.load(artifact_file)
+        except (pickle.UnpicklingError, EOFError, AttributeError):
+            artifact = None
+
+    if (artifact is not None and artifact['sources'] == sources and
+            os.path.isfile(pwl_filepath) and
+            compute_file_hash(pwl_filepath) == artifact['pwl_hash']):
+        return(artifact)
+
+    character_names = make_personal_word_list(
+        valid_spell_list_file, character_names_file, pwl_filepath)
+
+    artifact = {'sources': sources,
+                'pwl_hash': compute_file_hash(pwl_filepath),
+                'valid_words': frozenset(read_text_file(pwl_filepath)),
+                'character_names': character_names,
+                'corrections': compile_corrections(custom_corrections())}
+
+    write_dictionary_artifact(artifact, artifact_filepath)
+
+    return(artifact)
+
+
+def write_dictionary_artifact(artifact, artifact_filepath):
+    '''
+    pickles 'artifact' from 'load_dictionary_artifact' to 'artifact_filepath'
+    '''
+
+    import os
+    import pickle
+
+    # write to temporary file, so that an interrupted write leaves no artifact
+    temporary_filepath = artifact_filepath + '.partial'
+    with open(temporary_filepath, 'wb') as artifact_file:
+        pickle.dump(artifact, artifact_file, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_filepath, artifact_filepath)
+
+
+def load_known_words(pwl_filepath, dic_filepath=None, words=(),
+                     artifact_filepath='dictionary_artifact.pickle',
+                     language='en_US'):
+    '''
+    returns the frozenset of 'build_known_words' for the 'language' dictionary
+        with the personal word list at 'pwl_filepath', the Hunspell dictionary
+        file at 'dic_filepath' and 'words' (e.g., the valid spellings and the
+        words of the comics)
+    checking every candidate with enchant is slow, so the set is stored in the
+        artifact of 'load_dictionary_artifact', which must have been written
+        first, stamped with the hashes of the dictionary, its word lists and
+        'words'; it is loaded instead of rebuilt until one of them changes
+    '''
+
+    import os
+    import pickle
+    import enchant
+
+    dic_hash = ''
+    if dic_filepath is not None and os.path.isfile(dic_filepath):
+        dic_hash = compute_file_hash(dic_filepath)
+    sources = {'language': language,
+               'pwl': compute_file_hash(pwl_filepath),
+               'dictionary_words': dic_hash,
+               'words': hash_object(sorted({w.lower() for w in words}))}
+
+    artifact = None
+    if os.path.isfile(artifact_filepath):
+        try:
+            with open(artifact_filepath, 'rb') as artifact_file:
+                artifact = pickle.load(artifact_file)
+        except (pickle.UnpicklingError, EOFError, AttributeError):
+            artifact = None
+
+    stored = None
+    if artifact is not None:
+        stored = artifact.get('known_words')
+    if stored is not None and stored['sources'] == sources:
+        return(stored['words'])
+
+    known_words = build_known_words(
+        enchant.DictWithPWL(language, pwl_filepath), dic_filepath, words)
+
+    if artifact is not None:
+        artifact['known_words'] = {'sources': sources, 'words': known_words}
+        write_dictionary_artifact(artifact, artifact_filepath)
+
+    return(known_words)
+
+
+def load_spell_checker(pwl_filepath, character_names,
+                       suggestion_cache_filepath='suggestion_cache.sqlite',
+                       suggester_options=None, corrections_dict=None,
+                       known_words=None, panel_memo_filepath=None,
+                       skip_noise=False, segmenter=None,
+                       secondary_dictionaries=None):
+    '''
+    builds the dictionary, checker, tokenizer, customized corrections and
+        suggestion cache needed by 'correct_string_misspellings'
+    returns them as a dictionary keyed by the names of the parameters of
+        'correct_string_misspellings', so that it can be passed to
+        'correct_panels'
+    if 'suggester_options' is provided, a 'SymSpellSuggester' is built from
+        its 'dic_filepath', 'word_frequencies' and, if present, 'known_words'
+        and replaces the dictionary's suggestions
+    if 'corrections_dict' is not provided, the customized corrections are
+        compiled from 'custom_corrections'
+    if 'known_words' (see 'build_known_words') is provided, words in it are
+        accepted without calling enchant
+    if 'panel_memo_filepath' is provided, corrected panels are memoized in a
+        'PanelMemo' stored there
+    if 'skip_noise' is 'True', flagged sound effects and letter strings are
+        left as they are (see 'NoiseClassifier')
+    if 'segmenter' (a 'WordSegmenter') is provided, flagged run-together words
+        are split by it
+    if 'secondary_dictionaries' (a 'SecondaryDictionaries') is provided, flagged
+        words that it accepts are left as they are
+    the enchant objects can not be pickled, so each process that corrects text
+        must call this function itself
+    '''
+
+    import enchant
+    from enchant.checker import SpellChecker
+    from enchant.tokenize import get_tokenizer
+
+    dictionary = enchant.DictWithPWL('en_US', pwl_filepath)
+
+    if corrections_dict is None:
+        corrections_dict = compile_corrections(custom_corrections())
+
+    suggester = None
+    if suggester_options is not None:
+        suggester = build_symspell_suggester(
+            suggester_options['dic_filepath'], pwl_filepath,
+            suggester_options['word_frequencies'], dictionary,
+            suggester_options.get('known_words'))
+        suggestion_cache = SuggestionCache(suggester, suggester.version,
+                                           suggestion_cache_filepath)
+    else:
+        suggestion_cache = SuggestionCache(dictionary,
+                                           compute_file_hash(pwl_filepath),
+                                           suggestion_cache_filepath)
+
+    noise_classifier = None
+    if skip_noise:
+        noise_classifier = NoiseClassifier(dictionary.check)
+
+    panel_memo = None
+    if panel_memo_filepath is not None:
+        # any change to these inputs could change the correction of a panel
+        memo_inputs = [suggestion_cache.language, suggestion_cache.pwl_hash,
+                       corrections_dict, sorted(character_names)]
+        if skip_noise:
+            memo_inputs.append('skip_noise')
+        if segmenter is not None:
+            memo_inputs.append(segmenter.version)
+        if secondary_dictionaries is not None:
+            memo_inputs.append(secondary_dictionaries.version)
+        memo_version = hash_object(memo_inputs)
+        panel_memo = PanelMemo(memo_version, panel_memo_filepath)
+
+    resources = {'corrections_dict': corrections_dict,
+                 'character_names': character_names,
+                 'dictionary': dictionary,
+                 'checker': SpellChecker(dictionary),
+                 'tokenizer': get_tokenizer('en_US'),
+                 'suggestion_cache': suggestion_cache,
+                 'suggester': suggester,
+                 'known_words': known_words,
+                 'panel_memo': panel_memo,
+                 'noise_classifier': noise_classifier,
+                 'segmenter': segmenter,
+                 'secondary_dictionaries': secondary_dictionaries}
+
+    return(resources)
+
+
+def correct_panels(panels, resources, counters=None, timings=None,
+                   latencies=None):
+    '''
+    returns list of spelling-corrected strings for the list of 'panels' of a
+        comic, using the dictionary of 'resources' from 'load_spell_checker'
+    'counters' and 'timings' are passed to 'correct_string_misspellings'; if
+        'latencies' is provided, the seconds taken by each panel are appended
+    '''
+
+    import time
+
+    corrected = []
+    for p in panels:
+        start_time = time.perf_counter()
+        corrected.append(correct_string_misspellings(
+            p, counters=counters, timings=timings, **resources))
+        if latencies is not None:
+            latencies.append(time.perf_counter() - start_time)
+
+    return(corrected)
+
+
+def correct_rows(rows, resources, message_interval=None, stats=None):
+    '''
+    corrects 'rows', each of which is a list of panels
+    returns the corrected rows and, for each row, the number of words that the
+        spell checker flagged
+    if 'message_interval' is provided, a status message is printed every
+        'message_interval' rows
+    if 'stats' from 'make_run_stats' is provided, counts, stage timings and
+        per-panel latencies are added to it
+    '''
+
+    from collections import Counter
+
+    if stats is None:
+        stats = make_run_stats()
+
+    corrected_rows = []
+    checker_errors = []
+    rows_len = len(rows)
+
+    for j in range(rows_len):
+
+        # loop status message
+        if message_interval and (j % message_interval) == 0:
+            print('Processing file {0} of {1}, which is {2:.0f}%'
+                .format(j + 1, rows_len, 100 * (j + 1) / rows_len))
+
+        counters = Counter()
+        corrected_rows.append(correct_panels(
+            rows[j], resources, counters, stats['timings'],
+            stats['latencies']))
+        checker_errors.append(counters['checker_errors'])
+
+        counters['rows'] += 1
+        counters['panels'] += len(rows[j])
+        stats['counters'].update(counters)
+
+    return(corrected_rows, checker_errors)
+
+
+# spell-checking resources of a worker process; see 'initialize_worker'
+_worker_resources = {}
+
+# exception raised while building them, if any; see 'initialize_worker'
+_worker_setup_error = None
+
+
+def initialize_worker(pwl_filepath, character_names, suggestion_cache_filepath,
+                      suggester_options=None, corrections_dict=None,
+                      known_words=None, panel_memo_filepath=None,
+                      skip_noise=False, segmenter=None,
+                      secondary_dictionaries=None):
+    '''
+    builds the spell-checking resources once in each worker process
+    an exception is stored instead of raised, because a pool whose initializer
+        fails keeps starting new workers instead of failing; it is raised by
+        'correct_rows_in_worker', so that it reaches the parent process
+    '''
+
+    global _worker_setup_error
+
+    try:
+        _worker_resources.update(load_spell_checker(
+            pwl_filepath, character_names, suggestion_cache_filepath,
+            suggester_options, corrections_dict, known_words,
+            panel_memo_filepath, skip_noise, segmenter,
+            secondary_dictionaries))
+    except Exception as e:
+        _worker_setup_error = e
+
+
+def correct_rows_and_count(rows, resources, message_interval=None):
+    '''
+    corrects 'rows' with 'correct_rows' and flushes the suggestion cache and
+        the panel memo
+    returns the corrected rows, the number of words flagged by the spell
+        checker in each row, and the run statistics (see 'make_run_stats'),
+        including the suggestion cache and panel memo counts, for 'rows'
+    '''
+
+    from collections import Counter
+
+    stats = make_run_stats()
+    suggestion_cache = resources['suggestion_cache']
+    counts_before = Counter(suggestion_cache.counts())
+    panel_memo = resources.get('panel_memo')
+    if panel_memo is not None:
+        memo_counts_before = Counter(panel_memo.counts())
+
+    corrected_rows, checker_errors = correct_rows(rows, resources,
+                                                  message_interval, stats)
+
+    # flush after each call, because worker processes are not shut down
+    #   gracefully
+    suggestion_cache.flush()
+    stats['cache'].update(suggestion_cache.counts())
+    stats['cache'].subtract(counts_before)
+    if panel_memo is not None:
+        panel_memo.flush()
+        stats['panel_memo'].update(panel_memo.counts())
+        stats['panel_memo'].subtract(memo_counts_before)
+
+    return(corrected_rows, checker_errors, stats)
+
+
+def correct_rows_in_worker(rows):
+    '''
+    corrects a chunk of 'rows', each of which is a list of panels, in a worker
+        process set up by 'initialize_worker'
+    returns the same results as 'correct_rows_and_count'
+    raises the exception, if any, that 'initialize_worker' stored
+    '''
+
+    if _worker_setup_error is not None:
+        raise _worker_setup_error
+
+    return(correct_rows_and_count(rows, _worker_resources))
+
+
+def make_worker_pool(workers, pwl_filepath, character_names,
+                     suggestion_cache_filepath, suggester_options=None,
+                     corrections_dict=None, known_words=None,
+                     panel_memo_filepath=None, skip_noise=False,
+                     segmenter=None, secondary_dictionaries=None):
+    '''
+    starts pool of 'workers' processes, each with its own spell checker
+    the input files are checked first, so that a missing file is reported
+        before any worker starts
+    '''
+
+    import os
+    import multiprocessing
+
+    input_filepaths = [pwl_filepath]
+    if suggester_options is not None:
+        input_filepaths.append(suggester_options['dic_filepath'])
+    for filepath in input_filepaths:
+        if not os.path.isfile(filepath):
+            raise FileNotFoundError('No such file: {0!r}'.format(filepath))
+
+    pool = multiprocessing.Pool(
+        workers, initializer=initialize_worker,
+        initargs=(pwl_filepath, character_names, suggestion_cache_filepath,
+                  suggester_options, corrections_dict, known_words,
+                  panel_memo_filepath, skip_noise, segmenter,
+                  secondary_dictionaries))
+    return(pool)
+
+
+def correct_rows_in_parallel(rows, pool, workers, chunks_per_worker=4,
+                             print_progress=True):
+    '''
+    corrects 'rows', each of which is a list of panels, in 'pool' of 'workers'
+        processes from 'make_worker_pool'
+    'rows' are split into contiguous chunks, and the corrected rows and the
+        number of words flagged by the spell checker in each row are returned
+        in their original order, along with the merged run statistics of the
+        workers
+    '''
+
+    import math
+
+    chunk_size = max(1, math.ceil(len(rows) / (workers * chunks_per_worker)))
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+    corrected_rows = []
+    checker_errors = []
+    stats = make_run_stats()
+
+    for chunk_rows, chunk_errors, chunk_stats in pool.imap(
+            correct_rows_in_worker, chunks):
+        corrected_rows.extend(chunk_rows)
+        checker_errors.extend(chunk_errors)
+        merge_run_stats(stats, chunk_stats)
+        if print_progress:
+            print('Processed file {0} of {1}, which is {2:.0f}%'
+                  .format(len(corrected_rows), len(rows),
+                          100 * len(corrected_rows) / len(rows)))
+
+    return(corrected_rows, checker_errors, stats)
+
+
+def resolve_tokens(tokens, correctors):
+    '''
+    corrects each of the distinct 'tokens' on its own, exactly as
+        'correct_string_misspellings' would correct it within a panel
+    'correctors' is a dictionary of 'resources' from 'load_spell_checker' or of
+        a worker 'pool' and its number of 'workers'
+    returns dictionary that maps each token to its correction and the number of
+        words in it that the spell checker flagged, and the run statistics
+    '''
+
+    rows = [[t] for t in tokens]
+
+    if correctors.get('pool') is not None:
+        corrected_rows, checker_errors, stats = correct_rows_in_parallel(
+            rows, correctors['pool'], correctors['workers'],
+            print_progress=False)
+    else:
+        corrected_rows, checker_errors, stats = correct_rows_and_count(
+            rows, correctors['resources'])
+
+    # each token was counted as a row with one panel; rows, panels and flagged
+    #   words are counted again when the map is applied to the panels
+    stats['counters']['vocabulary_tokens'] += stats['counters'].pop('rows', 0)
+    stats['counters'].pop('panels', None)
+    stats['counters'].pop('checker_errors', None)
+    stats['latencies'] = []
+
+    resolved = {t: (c[0], e)
+                for t, c, e in zip(tokens, corrected_rows, checker_errors)}
+
+    return(resolved, stats)
+
+
+def apply_correction_map(a_string, tokens, correction_map):
+    '''
+    returns 'a_string' corrected by looking up each of its 'tokens', a list of
+        (word, offset) pairs from the tokenizer, in 'correction_map' from
+        'resolve_tokens'
+    the result is the same as from 'correct_string_misspellings'
+    '''
+
+    replacements = []
+    for word, offset in tokens:
+        correction = correction_map[word][0]
+        if correction != word.lower():
+            replacements.append((word, offset, correction))
+
+    # corrections are lowercase, so the rewritten string can be lowercased
+    return(rewrite_token_spans(a_string, replacements).lower())
+
+
+def correct_rows_by_vocabulary(rows, correction_map, correctors,
+                               message_interval=None):
+    '''
+    corrects 'rows', each of which is a list of panels, in two phases: first,
+        each distinct token that is not yet in 'correction_map' is corrected
+        once with 'resolve_tokens' and added to the map; then every distinct
+        panel text is rewritten by looking up its tokens in the map
+    the panels are exploded into a long-format table (see 'explode_panels'),
+        so that the rewritten texts are mapped onto all panels at once and then
+        regrouped into rows
+    'correctors' is described in 'resolve_tokens' and must also hold the
+        'tokenizer'
+    returns the same results as 'correct_rows_and_count'
+    '''
+
+    import time
+
+    tokenizer = correctors['tokenizer']
+
+    # panels are handled in long format, one row per panel, so that each
+    #   distinct panel text is tokenized and rewritten only once
+    panels = explode_panels(rows)
+    texts = panels['text'].unique()
+    tokens_by_text = {t: list(tokenizer(t)) for t in texts}
+    new_tokens = sorted({w for tokens in tokens_by_text.values()
+                         for w, _ in tokens if w not in correction_map})
+
+    resolved, stats = resolve_tokens(new_tokens, correctors)
+    correction_map.update(resolved)
+
+    if message_interval:
+        print('Applying correction map to {0} distinct panels of {1}'
+              .format(len(texts), len(panels)))
+
+    corrected_by_text = {}
+    errors_by_text = {}
+    for text in texts:
+        start_time = time.perf_counter()
+        tokens = tokens_by_text[text]
+        corrected_by_text[text] = apply_correction_map(text, tokens,
+                                                       correction_map)
+        errors_by_text[text] = sum(correction_map[w][1] for w, _ in tokens)
+        stats['latencies'].append(time.perf_counter() - start_time)
+
+    stats['timings']['apply_correction_map'] += sum(stats['latencies'])
+
+    panels['corrected'] = panels['text'].map(corrected_by_text)
+    panels['errors'] = panels['text'].map(errors_by_text)
+
+    panels_lens = [len(r) for r in rows]
+    corrected_rows = regroup_panels(panels['corrected'], panels_lens)
+    checker_errors = (panels.groupby('row')['errors'].sum()
+                      .reindex(range(len(rows)), fill_value=0).tolist())
+
+    stats['counters']['rows'] += len(rows)
+    stats['counters']['panels'] += len(panels)
+    stats['counters']['checker_errors'] += sum(checker_errors)
+
+    return(corrected_rows, checker_errors, stats)
+
+
+def write_correction_map(correction_map, correction_map_filepath):
+    '''
+    writes the entries of 'correction_map' from 'resolve_tokens' that change
+        a token (other than lowercasing it) or that the spell checker flagged
+        to a JSON file for inspection
+    '''
+
+    import json
+
+    inspected = sorted((w, list(c)) for w, c in correction_map.items()
+                       if c[0] != w.lower() or c[1])
+
+    # one entry per line, so that the file is easy to read and to diff
+    with open(correction_map_filepath, 'w', encoding='utf-8') as map_file:
+        map_file.write('{\n')
+        map_file.write(',\n'.join(
+            '{0}: {1}'.format(json.dumps(w, ensure_ascii=False),
+                              json.dumps(c, ensure_ascii=False))
+            for w, c in inspected))
+        map_file.write('\n}\n')
+
+
+def correct_row_batch(rows, correctors, message_interval=None):
+    '''
+    corrects 'rows', each of which is a list of panels, with the 'correctors'
+        that 'main' set up:
+        'resources' from 'load_spell_checker', or a worker 'pool' and its
+            number of 'workers'
+        optionally, a 'correction_map' and 'tokenizer' for
+            'correct_rows_by_vocabulary'
+    returns the same results as 'correct_rows_and_count'
+    '''
+
+    if correctors.get('correction_map') is not None:
+        return(correct_rows_by_vocabulary(rows, correctors['correction_map'],
+                                          correctors, message_interval))
+
+    if correctors.get('pool') is not None:
+        return(correct_rows_in_parallel(rows, correctors['pool'],
+                                        correctors['workers'],
+                                        print_progress=bool(message_interval)))
+
+    return(correct_rows_and_count(rows, correctors['resources'],
+                                  message_interval))
+
+
+def hash_object(an_object):
+    '''
+    returns hexadecimal SHA-1 hash of 'an_object', which must be serializable
+        as JSON
+    '''
+
+    import hashlib
+    import json
+
+    serialized = json.dumps(an_object, sort_keys=True, ensure_ascii=False)
+    return(hashlib.sha1(serialized.encode('utf-8')).hexdigest())
+
+
+def make_row_records(keys, rows, checker_errors):
+    '''
+    returns dictionary that maps each row's file name in 'keys' to a content
+        hash of the row's panels and the number of words in the row that the
+        spell checker flagged
+    '''
+
+    row_records = {k: [hash_object(r), e]
+                   for k, r, e in zip(keys, rows, checker_errors)}
+    return(row_records)
+
+
+def make_options_hash(suggester='enchant', dic_filepath=None,
+                      skip_noise=False, segmenter=None,
+                      secondary_dictionaries=None):
+    '''
+    returns hash of the options that change the corrections or the compiled
+        misspellings, so that outputs made with other options are not reused
+        (see 'make_correction_manifest', 'correct_table_in_chunks' and
+        'compile_misspellings')
+    '''
+
+    options = {'suggester': suggester}
+    if suggester == 'symspell':
+        options['dictionary_words_hash'] = compute_file_hash(dic_filepath)
+    if skip_noise:
+        options['skip_noise'] = True
+    if segmenter is not None:
+        options['segmenter_version'] = segmenter.version
+    if secondary_dictionaries is not None:
+        options['secondary_version'] = secondary_dictionaries.version
+
+    return(hash_object(options))
+
+
+def make_correction_manifest(row_records, valid_words, corrections_dict,
+                             options_hash=''):
+    '''
+    returns manifest that records the inputs of a run of 'main', so that a
+        later run can determine which rows need to be corrected again
+    the manifest holds the 'row_records' from 'make_row_records', and the word
+        lists and customized corrections that the run used, along with their
+        version hashes, and the 'options_hash' of the correction options (see
+        'make_options_hash')
+    '''
+
+    valid_words = sorted(set(valid_words))
+    manifest = {
+        'options_hash': options_hash,
+        'valid_words_hash': hash_object(valid_words),
+        'corrections_hash': hash_object(corrections_dict),
+        'valid_words': valid_words,
+        'corrections': corrections_dict,
+        'rows': row_records}
+    return(manifest)
+
+
+def read_manifest(manifest_filepath):
+    '''
+    reads manifest written by 'write_manifest'; returns 'None' if there is none
+    '''
+
+    import os
+    import json
+
+    if not os.path.isfile(manifest_filepath):
+        return(None)
+
+    with open(manifest_filepath, encoding='utf-8') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    return(manifest)
+
+
+def write_manifest(manifest, manifest_filepath):
+    '''
+    writes 'manifest' from 'make_correction_manifest' to a JSON file
+    '''
+
+    import json
+
+    with open(manifest_filepath, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False)
+
+
+def select_rows_to_correct(keys, rows, valid_words, corrections_dict, manifest,
+                           previous_keys, tokenizer, options_hash=''):
+    '''
+    returns indices of 'rows' that must be corrected again, given the
+        'manifest' of the previous run and the file names ('previous_keys') of
+        the rows in its output
+    all rows are corrected again if the correction options ('options_hash')
+        have changed
+    otherwise, a row is corrected again if:
+        it is new or its panels have changed
+        it contains a word that was added to or removed from the valid words
+            (the personal word list, which includes the character names)
+        it contains a word whose customized correction was added, removed or
+            changed
+        the valid words have changed and the spell checker flagged words in the
+            row, because the dictionary's suggestions for those words might
+            differ now
+    '''
+
+    if manifest is None or manifest.get('options_hash') != options_hash:
+        return(list(range(len(rows))))
+
+    valid_words = set(valid_words)
+    previous_valid_words = set(manifest['valid_words'])
+    changed_valid_words = valid_words.symmetric_difference(previous_valid_words)
+
+    previous_corrections = manifest['corrections']
+    changed_corrections = {
+        k for k in set(corrections_dict).union(previous_corrections)
+        if corrections_dict.get(k) != previous_corrections.get(k)}
+
+    previous_keys = set(previous_keys)
+    previous_rows = manifest['rows']
+    row_indices = []
+
+    for j in range(len(rows)):
+
+        if keys[j] not in previous_keys or keys[j] not in previous_rows:
+            row_indices.append(j)
+            continue
+
+        row_hash, checker_errors = previous_rows[keys[j]]
+        if row_hash != hash_object(rows[j]):
+            row_indices.append(j)
+            continue
+
+        if changed_valid_words and checker_errors:
+            row_indices.append(j)
+            continue
+
+        for panel in rows[j]:
+            if changed_corrections and any(
+                    w in changed_corrections for w, _ in tokenizer(panel)):
+                row_indices.append(j)
+                break
+
+            # the valid words apply to the text that the spell checker sees,
+            #   i.e., after customized corrections and lowercasing
+            if changed_valid_words:
+                checked_text = apply_custom_corrections(
+                    panel, corrections_dict, tokenizer).lower()
+                if any(w in changed_valid_words
+                       for w, _ in tokenizer(checked_text)):
+                    row_indices.append(j)
+                    break
+
+    return(row_indices)
+
+
+def read_table_chunks(table_filepath, column_of_lists, chunksize):
+    '''
+    reads table from 'csv' file in chunks of 'chunksize' rows
+    returns an iterator over the chunks; each item in column 'column_of_lists'
+        is read as a list, as in 'read_table'
+    '''
+
+    import pandas as pd
+    from ast import literal_eval
+
+    # '^' used as separator because it does not appear in any text descriptions
+    chunks = pd.read_csv(table_filepath, sep='^', chunksize=chunksize,
+                         converters={column_of_lists: literal_eval})
+
+    return(chunks)
+
+
+def read_checkpoint(checkpoint_filepath, run_parameters):
+    '''
+    reads checkpoint written by 'correct_table_in_chunks'
+    the first line of the checkpoint file holds the parameters of the run; each
+        following line records a completed chunk
+    returns list of completed chunk records, which is empty if there is no
+        checkpoint or if it was written by a run with other 'run_parameters'
+    a partially written last line, e.g., from a crash, is ignored
+    '''
+
+    import os
+    import json
+
+    if not os.path.isfile(checkpoint_filepath):
+        return([])
+
+    chunk_records = []
+
+    with open(checkpoint_filepath, encoding='utf-8') as checkpoint_file:
+        lines = checkpoint_file.read().split('\n')
+
+    try:
+        if json.loads(lines[0]) != run_parameters:
+            return([])
+        for line in lines[1:]:
+            chunk_records.append(json.loads(line))
+    except ValueError:
+        pass
+
+    return(chunk_records)
+
+
+def run_staged_pipeline(items, process, consume, queue_size, stats):
+    '''
+    runs three stages concurrently:  a reader thread that iterates 'items', the
+        calling thread that applies 'process' to each item, and a writer thread
+        that calls 'consume' on each result in the order of 'items'
+    the stages are connected by queues of at most 'queue_size' items, so that
+        a slow stage holds back the stages before it instead of letting items
+        pile up in memory
+    the seconds that each stage waited on its queues and the depths of the
+        queues are added to 'stats['pipeline']' (see 'make_run_stats'):  e.g.,
+        if the reader often waits for room in the input queue, the correction
+        is the bottleneck
+    an exception in any stage stops the pipeline and is raised again
+    '''
+
+    import time
+    import queue
+    import threading
+
+    input_queue = queue.Queue(queue_size)
+    output_queue = queue.Queue(queue_size)
+    end_of_items = object()
+    stop = threading.Event()
+    errors = []
+
+    pipeline = stats['pipeline']
+    for key in ['reader_full_wait', 'process_empty_wait',
+                'process_full_wait', 'writer_empty_wait', 'input_depth_sum',
+                'input_depth_max', 'output_depth_sum', 'output_depth_max',
+                'items']:
+        pipeline[key] += 0
+
+    def put(a_queue, item, wait_key, depth_key):
+        # waits in short steps, so that a stopped pipeline does not block
+        start_time = time.perf_counter()
+        while True:
+            try:
+                a_queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                if stop.is_set():
+                    return()
+        pipeline[wait_key] += time.perf_counter() - start_time
+        depth = a_queue.qsize()
+        pipeline[depth_key + '_sum'] += depth
+        pipeline[depth_key + '_max'] = max(pipeline[depth_key + '_max'], depth)
+
+    def put_end(a_queue):
+        # the end of the items always reaches its queue:  when the pipeline is
+        #   stopped, items that will not be used are dropped to make room
+        while True:
+            try:
+                a_queue.put(end_of_items, timeout=0.1)
+                return()
+            except queue.Full:
+                if stop.is_set():
+                    try:
+                        a_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def get(a_queue, wait_key):
+        # waits in short steps, so that a stopped pipeline whose queue stays
+        #   empty ends instead of blocking
+        start_time = time.perf_counter()
+        while True:
+            try:
+                item = a_queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if stop.is_set():
+                    item = end_of_items
+                    break
+        pipeline[wait_key] += time.perf_counter() - start_time
+        return(item)
+
+    def read():
+        try:
+            for item in items:
+                if stop.is_set():
+                    break
+                put(input_queue, item, 'reader_full_wait', 'input_depth')
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put_end(input_queue)
+
+    def write():
+        while True:
+            result = get(output_queue, 'writer_empty_wait')
+            if result is end_of_items:
+                break
+            if stop.is_set():
+                continue
+            try:
+                consume(result)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+    reader = threading.Thread(target=read, name='pipeline-reader')
+    writer = threading.Thread(target=write, name='pipeline-writer')
+    reader.start()
+    writer.start()
+
+    try:
+        while True:
+            item = get(input_queue, 'process_empty_wait')
+            if item is end_of_items:
+                break
+            if stop.is_set():
+                continue
+            result = process(item)
+            pipeline['items'] += 1
+            put(output_queue, result, 'process_full_wait', 'output_depth')
+    except BaseException as e:
+        errors.append(e)
+        stop.set()
+    finally:
+        # the reader stops at the next item, and its queue is drained so that
+        #   it can put the end of the items
+        while reader.is_alive():
+            try:
+                input_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        put_end(output_queue)
+        reader.join()
+        writer.join()
+
+    if errors:
+        raise errors[0]
+
+
+def pipeline_report(pipeline):
+    '''
+    returns string summarizing the waits and queue depths of the stages of
+        'run_staged_pipeline' from 'pipeline' counts
+    '''
+
+    items = max(pipeline['items'], 1)
+    report = ('Pipeline: {0} items; reader waited {1:.3f} s for room, '
+              'correction waited {2:.3f} s for input and {3:.3f} s for room, '
+              'writer waited {4:.3f} s for input\n'
+              '  queue depth: input mean {5:.1f} max {6}, '
+              'output mean {7:.1f} max {8}'
+              .format(pipeline['items'], pipeline['reader_full_wait'],
+                      pipeline['process_empty_wait'],
+                      pipeline['process_full_wait'],
+                      pipeline['writer_empty_wait'],
+                      pipeline['input_depth_sum'] / items,
+                      pipeline['input_depth_max'],
+                      pipeline['output_depth_sum'] / items,
+                      pipeline['output_depth_max']))
+    return(report)
+
+
+def correct_table_in_chunks(table_filepath, text_col_name, chunksize,
+                            output_filepath, run_parameters, stats,
+                            correctors, pipeline_depth=0):
+    '''
+    reads, corrects and writes the table in chunks of 'chunksize' rows, so
+        that the whole table is never held in memory
+    each corrected chunk is appended to a partial output file, and a
+        checkpoint that records the chunk is written after the chunk is safely
+        on disk; if the run is interrupted, the next run with the same
+        'run_parameters' resumes after the last completed chunk
+    when all chunks are completed, the partial output file replaces
+        'output_filepath' and the checkpoint is removed
+    rows are corrected with 'correct_row_batch' and 'correctors'
+    if 'pipeline_depth' is greater than 0, chunks are read, corrected and
+        written concurrently by 'run_staged_pipeline', with up to
+        'pipeline_depth' chunks waiting between the stages
+    run statistics, including the time spent reading and writing chunks, are
+        added to 'stats' from 'make_run_stats'
+    returns row records (see 'make_row_records')
     '''
-    replaces substring 'original_str' with 'replacement_str' in 'a_string'
+
+    import os
+    import json
+    import itertools
+
+    text_corrected_col_name = 'text_spell_corrected'
+    partial_filepath = output_filepath + '.partial'
+    checkpoint_filepath = os.path.splitext(output_filepath)[0] + '_checkpoint.jsonl'
+
+    chunk_records = read_checkpoint(checkpoint_filepath, run_parameters)
+    if not os.path.isfile(partial_filepath):
+        chunk_records = []
+
+    if chunk_records:
+        # discard anything written after the last completed chunk
+        output_bytes = chunk_records[-1]['output_bytes']
+        with open(partial_filepath, 'r+b') as partial_file:
+            partial_file.truncate(output_bytes)
+        print('Resuming after chunk {0} ({1} rows per chunk)'
+              .format(len(chunk_records), chunksize))
+    else:
+        output_bytes = 0
+        with open(checkpoint_filepath, 'w', encoding='utf-8') as checkpoint_file:
+            checkpoint_file.write(json.dumps(run_parameters))
+        with open(partial_filepath, 'w', encoding='utf-8'):
+            pass
+
+    row_records = {}
+    for chunk_record in chunk_records:
+        row_records.update(chunk_record['rows'])
+
+    def read_chunks():
+        # yields the chunks that are not completed yet with their numbers and
+        #   the number of rows read through them
+        rows_processed = 0
+        chunks = iter(read_table_chunks(table_filepath, text_col_name,
+                                        chunksize))
+        for chunk_number in itertools.count():
+            with StageTimer(stats['timings'], 'read_table'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            rows_processed += len(chunk)
+            if chunk_number < len(chunk_records):
+                stats['counters']['rows_skipped'] += len(chunk)
+                continue
+            yield(chunk_number, rows_processed, chunk)
+
+    def correct_chunk(item):
+        chunk_number, rows_processed, chunk = item
+        keys = chunk.iloc[:, 0].tolist()
+        rows = chunk[text_col_name].tolist()
+
+        corrected_rows, checker_errors, chunk_stats = correct_row_batch(
+            rows, correctors)
+        merge_run_stats(stats, chunk_stats)
+
+        chunk[text_corrected_col_name] = corrected_rows
+        chunk_rows = make_row_records(keys, rows, checker_errors)
+
+        return(chunk_number, rows_processed, chunk, chunk_rows)
+
+    def write_chunk(result):
+        nonlocal output_bytes
+        chunk_number, rows_processed, chunk, chunk_rows = result
+
+        with StageTimer(stats['timings'], 'write_table'):
+            with open(partial_filepath, 'a', encoding='utf-8') as partial_file:
+                chunk.to_csv(partial_file, sep='^', index=False,
+                             header=(output_bytes == 0))
+                partial_file.flush()
+                os.fsync(partial_file.fileno())
+                output_bytes = partial_file.tell()
+
+        row_records.update(chunk_rows)
+
+        with open(checkpoint_filepath, 'a', encoding='utf-8') as checkpoint_file:
+            checkpoint_file.write('\n' + json.dumps(
+                {'output_bytes': output_bytes, 'rows': chunk_rows}))
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+
+        print('Processed chunk {0}, through file {1}'
+              .format(chunk_number + 1, rows_processed))
+
+    if pipeline_depth > 0:
+        run_staged_pipeline(read_chunks(), correct_chunk, write_chunk,
+                            pipeline_depth, stats)
+    else:
+        for item in read_chunks():
+            write_chunk(correct_chunk(item))
+
+    os.replace(partial_filepath, output_filepath)
+    os.remove(checkpoint_filepath)
+
+    return(row_records)
+
+
+def parse_arguments(argv=None):
+    '''
+    parses command-line arguments for 'main'
+    '''
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Spell-checks and corrects descriptions of Peanuts comics')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of processes that correct the table; '
+                        'default is 1, which corrects it serially')
+    parser.add_argument('--incremental', action='store_true',
+                        help='correct only rows whose text, or whose words in '
+                        'the valid spellings, character names or customized '
+                        'corrections, have changed since the previous run')
+    parser.add_argument('--table', default=None,
+                        help='table of comics to correct, as a \'csv\', '
+                        '\'parquet\' or \'feather\' file; default is '
+                        '\'table.csv\' in the sibling folder \'04_divide_text\'')
+    parser.add_argument('--output-format', default='csv',
+                        choices=['csv', 'parquet', 'feather', 'patch'],
+                        help='format of the corrected table; \'parquet\' and '
+                        '\'feather\' store the lists of panels natively and '
+                        'load much faster than \'csv\'; \'patch\' writes only '
+                        'the changes to the panels that the correction changed '
+                        '(see --apply-patch)')
+    parser.add_argument('--apply-patch', default=None,
+                        help='instead of correcting the table, write the '
+                        'corrected table in --output-format from the table and '
+                        'this patch from an earlier run')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='read, correct and write the table in chunks of '
+                        'this many rows; an interrupted run resumes after the '
+                        'last completed chunk')
+    parser.add_argument('--pipeline-depth', type=int, default=0,
+                        help='with --chunksize, read, correct and write chunks '
+                        'in concurrent stages, with up to this many chunks '
+                        'waiting between stages; default is 0, which runs the '
+                        'stages one after another')
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        default=None,
+                        help='profile the run with cProfile or pyinstrument; '
+                        'with several workers, only the main process is '
+                        'profiled')
+    parser.add_argument('--vocabulary-first', action='store_true',
+                        help='correct each distinct token once, then rewrite '
+                        'every panel by looking up its tokens; the resulting '
+                        'correction map is written for inspection')
+    parser.add_argument('--suggester', choices=['enchant', 'symspell'],
+                        default='enchant',
+                        help='source of suggested corrections: enchant, or an '
+                        'in-process symmetric delete index of the dictionary '
+                        'words, valid spellings and character names, ranked '
+                        'by frequency in the comics')
+    parser.add_argument('--prefilter', action='store_true',
+                        help='accept words from the dictionary, valid '
+                        'spellings, character names and comics that the '
+                        'spell checker accepts, from an in-memory set, without '
+                        'calling enchant')
+    parser.add_argument('--skip-noise', action='store_true',
+                        help='leave flagged words that look like sound effects '
+                        'or strings of random letters as they are, instead of '
+                        'asking the spell checker for suggestions')
+    parser.add_argument('--segment', action='store_true',
+                        help='split flagged run-together words, like '
+                        '\'thatSally\', into the dictionary words, valid '
+                        'spellings and character names that they are made of, '
+                        'instead of asking the spell checker for suggestions')
+    parser.add_argument('--secondary-languages', nargs='*', default=None,
+                        metavar='LANGUAGE',
+                        help='accept flagged words that are correct in these '
+                        'languages (e.g., fr_FR de_DE) or that are sung '
+                        'syllables, instead of asking the spell checker for '
+                        'suggestions; with no languages, only the sung '
+                        'syllables are accepted')
+    parser.add_argument('--panel-memo', action='store_true',
+                        help='memoize corrected panels, so that panels that '
+                        'repeat verbatim, in this run or in later runs, are '
+                        'corrected only once')
+    parser.add_argument('--dictionary-words',
+                        default='/usr/share/hunspell/en_US.dic',
+                        help='Hunspell dictionary file with the words for the '
+                        'symspell suggester and the prefilter')
+
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.chunksize is not None and args.chunksize < 1:
+        parser.error('--chunksize must be at least 1')
+    if args.pipeline_depth < 0:
+        parser.error('--pipeline-depth must be at least 0')
+    if args.pipeline_depth and not args.chunksize:
+        parser.error('--pipeline-depth needs --chunksize')
+    if args.chunksize and args.incremental:
+        parser.error('--incremental can not be combined with --chunksize')
+    if args.chunksize and (args.output_format != 'csv' or
+                           (args.table is not None and
+                            get_table_format(args.table) != 'csv')):
+        parser.error('--chunksize can only stream \'csv\' tables')
+    if args.apply_patch and args.output_format == 'patch':
+        parser.error('--apply-patch needs a table --output-format')
+
+    return(args)
+
+
+def start_profiler(profiler_name):
+    '''
+    starts and returns a 'cprofile' or 'pyinstrument' profiler
+    returns 'None' if 'profiler_name' is 'None'
+    '''
+
+    if profiler_name == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profiler_name == 'pyinstrument':
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+    else:
+        profiler = None
+
+    return(profiler)
+
+
+def stop_profiler(profiler, profiler_name, output_filepath='spell_check.prof'):
+    '''
+    stops 'profiler' from 'start_profiler' and prints its results
+    cProfile statistics are also saved to 'output_filepath' for later
+        inspection, e.g., with 'pstats' or 'snakeviz'
+    '''
+
+    if profiler_name == 'cprofile':
+        import pstats
+        profiler.disable()
+        profiler.dump_stats(output_filepath)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+    elif profiler_name == 'pyinstrument':
+        profiler.stop()
+        print(profiler.output_text(unicode=True))
+
+
+def make_panel_patch(original, corrected):
+    '''
+    returns list of [start, end, replacement] spans that turn the lowercased
+        'original' panel into its 'corrected' panel
+    the panels are compared as sequences of words and of the characters between
+        words, so that each span replaces whole words, like the corrections do
+    the list is empty if the panel was only lowercased
     '''
 
     import re
+    import itertools
+    from difflib import SequenceMatcher
 
-    start_idx = [s.start() for s in re.finditer(original_str, a_string)]
+    lowercased = original.lower()
+    if corrected == lowercased:
+        return([])
 
-    for i in range(len(start_idx)-1, -1, -1):
-        end_idx = start_idx[i] + len(original_str)
-        new_string = a_string[:start_idx[i]] + replacement_str + a_string[end_idx:]
-        a_string = new_string
+    original_pieces = re.findall(r'\w+|\W+', lowercased)
+    corrected_pieces = re.findall(r'\w+|\W+', corrected)
+    offsets = [0] + list(itertools.accumulate(len(p) for p in original_pieces))
 
-    return(a_string)
+    matcher = SequenceMatcher(None, original_pieces, corrected_pieces,
+                              autojunk=False)
+    spans = [[offsets[i1], offsets[i2], ''.join(corrected_pieces[j1:j2])]
+             for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
 
+    return(spans)
 
-def correct_string_misspellings(a_string, corrections_dict, character_names,
-                                dictionary, checker, tokenizer):
+
+def apply_panel_patch(original, spans):
     '''
-    Given 'a_string', returns a spelling-corrected 'a_string'
-    Corrections customized for descriptions of Peanuts comics are applied first,
-        then a standard English dictionary is used for corrections
+    returns the corrected panel from the 'original' panel and its 'spans' from
+        'make_panel_patch'
     '''
 
-    # customized corrections
-    tokens = [w[0] for w in tokenizer(a_string)]
-    for k in corrections_dict:
-        if k in tokens:
-            a_string = replace_substring(a_string, k, corrections_dict[k])
-    a_string = a_string.lower()
+    lowercased = original.lower()
 
-    # correct string according to spell check with full English dictionary
-    checker.set_text(a_string)
-    for e in checker:
-        suggestions = dictionary.suggest(e.word)
-        if suggestions:
-            a_string = replace_substring(a_string, e.word, suggestions[0])
-    a_string = a_string.lower()     # spell check dictionary capitalizes some words
+    pieces = []
+    end = 0
+    for span_start, span_end, replacement in spans:
+        pieces.append(lowercased[end:span_start])
+        pieces.append(replacement)
+        end = span_end
+    pieces.append(lowercased[end:])
 
-    return(a_string)
+    return(''.join(pieces))
+
+
+def write_table_patch(keys, rows, corrected_rows, patch_filepath, header):
+    '''
+    writes a patch with only the panels of 'rows' that their 'corrected_rows'
+        change (other than lowercasing them) to a JSON Lines file at
+        'patch_filepath'
+    the first line holds 'header', e.g., the hash of the table that was
+        corrected; each following line holds the 'filename' (from 'keys'),
+        'panel_index' and 'spans' (see 'make_panel_patch') of a changed panel
+    '''
+
+    import os
+    import json
+
+    temporary_filepath = patch_filepath + '.partial'
+    with open(temporary_filepath, 'w', encoding='utf-8') as patch_file:
+        patch_file.write(json.dumps(header) + '\n')
+        for key, panels, corrected_panels in zip(keys, rows, corrected_rows):
+            for i, (panel, corrected) in enumerate(zip(panels,
+                                                       corrected_panels)):
+                spans = make_panel_patch(panel, corrected)
+                if spans:
+                    patch_file.write(json.dumps(
+                        {'filename': str(key), 'panel_index': i,
+                         'spans': spans}, ensure_ascii=False) + '\n')
+
+    os.replace(temporary_filepath, patch_filepath)
 
 
-def main():
+def read_table_patch(patch_filepath):
+    '''
+    reads patch written by 'write_table_patch'
+    returns its header and a dictionary of the spans of each changed panel,
+        keyed by its 'filename' and 'panel_index'
+    '''
+
+    import json
+
+    spans = {}
+    with open(patch_filepath, encoding='utf-8') as patch_file:
+        header = json.loads(next(patch_file))
+        for line in patch_file:
+            record = json.loads(line)
+            spans[(record['filename'], record['panel_index'])] = record['spans']
+
+    return(header, spans)
+
+
+def apply_table_patch(keys, rows, patch_spans):
+    '''
+    returns the corrected rows from 'rows', each of which is a list of panels,
+        and the spans from 'read_table_patch'; panels that are not in the patch
+        are only lowercased
+    '''
+
+    corrected_rows = []
+    for key, panels in zip(keys, rows):
+        key = str(key)
+        corrected_rows.append([
+            apply_panel_patch(p, patch_spans.get((key, i), []))
+            for i, p in enumerate(panels)])
+
+    return(corrected_rows)
+
+
+def materialize_table_patch(table_filepath, text_col_name, patch_filepath,
+                            output_filepath):
+    '''
+    writes the corrected table to 'output_filepath' from the table at
+        'table_filepath' and the patch at 'patch_filepath' that was written
+        when the table was corrected
+    raises 'ValueError' if the patch was made from another table
+    '''
+
+    header, patch_spans = read_table_patch(patch_filepath)
+    if header['table_hash'] != compute_file_hash(table_filepath):
+        raise ValueError('Patch {0} was not made from table {1}'
+                         .format(patch_filepath, table_filepath))
+
+    table = read_table(table_filepath, text_col_name)
+    table['text_spell_corrected'] = apply_table_patch(
+        table.iloc[:, 0].tolist(), table[text_col_name].tolist(), patch_spans)
+    write_table(table, output_filepath)
+
+
+def correct_whole_table(table_filepath, text_col_name, output_filepath,
+                        manifest, valid_words, corrections_dict, stats,
+                        correctors, incremental=False, patch_header=None,
+                        options_hash=''):
+    '''
+    reads, corrects and writes the whole table at once
+    if 'patch_header' is provided, only the changed panels are written, as a
+        patch with that header (see 'write_table_patch'), instead of the table
+    if 'incremental' is 'True', only the rows selected by
+        'select_rows_to_correct' for the 'manifest' of the previous run and the
+        'options_hash' of this run are corrected, and the other rows are copied
+        from the previous output
+    rows are corrected with 'correct_row_batch' and 'correctors'
+    run statistics, including the time spent reading and writing the table,
+        are added to 'stats' from 'make_run_stats'
+    returns row records (see 'make_row_records')
+    '''
+
+    import os
+
+    text_corrected_col_name = 'text_spell_corrected'
+
+    with StageTimer(stats['timings'], 'read_table'):
+        table = read_table(table_filepath, text_col_name)
+    keys = table.iloc[:, 0].tolist()
+    rows = table[text_col_name].tolist()
+
+    comics_list = [None] * len(rows)
+    checker_errors = [0] * len(rows)
+    row_indices = list(range(len(rows)))
+
+    if incremental and os.path.isfile(output_filepath):
+        from enchant.tokenize import get_tokenizer
+
+        if patch_header is not None:
+            previous_table = table[[table.columns[0]]].copy()
+            previous_table[text_corrected_col_name] = apply_table_patch(
+                keys, rows, read_table_patch(output_filepath)[1])
+        else:
+            previous_table = read_table(
+                output_filepath, text_corrected_col_name,
+                columns=[table.columns[0], text_corrected_col_name])
+        previous_keys = previous_table.iloc[:, 0].tolist()
+        row_indices = select_rows_to_correct(
+            keys, rows, valid_words, corrections_dict, manifest, previous_keys,
+            get_tokenizer('en_US'), options_hash)
+
+        # rows that are not corrected again are copied from the previous run
+        previous_corrected = dict(zip(
+            previous_keys, previous_table[text_corrected_col_name]))
+        for j in set(range(len(rows))).difference(row_indices):
+            comics_list[j] = previous_corrected[keys[j]]
+            checker_errors[j] = manifest['rows'][keys[j]][1]
+
+        stats['counters']['rows_skipped'] += len(rows) - len(row_indices)
+        print('Skipping {0} of {1} rows whose inputs have not changed'
+              .format(len(rows) - len(row_indices), len(rows)))
+
+    rows_to_correct = [rows[j] for j in row_indices]
+
+    corrected_rows, corrected_errors, correction_stats = correct_row_batch(
+        rows_to_correct, correctors, message_interval=100)
+    merge_run_stats(stats, correction_stats)
+
+    for j, corrected, errors in zip(row_indices, corrected_rows,
+                                    corrected_errors):
+        comics_list[j] = corrected
+        checker_errors[j] = errors
+
+    table[text_corrected_col_name] = comics_list
+
+    with StageTimer(stats['timings'], 'write_table'):
+        if patch_header is not None:
+            write_table_patch(keys, rows, comics_list, output_filepath,
+                              patch_header)
+        else:
+            write_table(table, output_filepath)
+
+    return(make_row_records(keys, rows, checker_errors))
+
+
+def main(argv=None):
     '''
     Spell-checks and corrects descriptions of Peanuts comics
     Misspellings that a standard English dictionary can not correct are handled
@@ -621,61 +3918,192 @@ def main():
     Table with descriptions is read from a 'csv' file; spelling-corrected
         descriptions are added as the right-most column in the table and written
         out to a new 'csv' file in the present working directory
+    With '--output-format parquet' or 'feather', the corrected table is written
+        in that binary columnar format instead, and '--table' can read the
+        descriptions from one
+    With '--output-format patch', only the changes to the panels that were
+        changed by the correction are written, and '--apply-patch' writes the
+        corrected table from the patch later
+    With '--workers N', the table is corrected in 'N' processes, each with its
+        own spell checker; the results are identical to the serial run
+    Each run writes a manifest of its inputs next to the output table; with
+        '--incremental', rows whose inputs have not changed since the previous
+        run are copied from the previous output instead of being corrected
+    With '--chunksize N', the table is streamed through the correction 'N' rows
+        at a time, and an interrupted run resumes from its last completed chunk
+    With '--pipeline-depth N' as well, the chunks are read, corrected and
+        written in concurrent stages, connected by queues of up to 'N' chunks
+    With '--suggester symspell', suggestions come from an in-process symmetric
+        delete index instead of from enchant
+    With '--prefilter', words that the spell checker is known to accept are
+        accepted from an in-memory set, and only the others are checked by
+        enchant
+    With '--skip-noise', flagged words that look like sound effects or random
+        letters are left as they are instead of going to the suggester
+    With '--segment', flagged run-together words are split into the words that
+        they are made of (see 'WordSegmenter')
+    With '--secondary-languages fr_FR de_DE', flagged words that are correct in
+        those languages or are sung syllables are left as they are (see
+        'SecondaryDictionaries')
+    With '--panel-memo', panels that repeat verbatim are corrected only once and
+        then looked up in a memo that later runs share
+    With '--vocabulary-first', each distinct token in the table is corrected
+        only once, and panels are rewritten from the resulting correction map,
+        which is also written out for inspection
+    At the end of the run, the time spent in each stage, throughput and
+        per-panel latency are reported; '--profile' adds a cProfile or
+        pyinstrument profile
     '''
 
     import os
-    import enchant
-    from enchant.checker import SpellChecker
-    from enchant.tokenize import get_tokenizer
+    import time
+
+    args = parse_arguments(argv)
+
+    start_time = time.perf_counter()
+    profiler = start_profiler(args.profile)
+    stats = make_run_stats()
 
     table_folder = '04_divide_text'
     table_file = 'table.csv'
-    table_filepath = os.path.join(get_sibling_directory_path(table_folder),
-                                  table_file)
-
-    table_col = 3
+    table_filepath = args.table
+    if table_filepath is None:
+        table_filepath = os.path.join(get_sibling_directory_path(table_folder),
+                                      table_file)
     text_col_name = 'text_by_panels'
-    table = read_table(table_filepath, text_col_name)
+
+    if args.apply_patch:
+        with StageTimer(stats['timings'], 'apply_patch'):
+            materialize_table_patch(table_filepath, text_col_name,
+                                    args.apply_patch,
+                                    'table.' + args.output_format)
+        print(run_stats_report(stats, time.perf_counter() - start_time))
+        return()
 
     #misspell_table = compile_misspellings(table_filepath)
-    valid_words = read_text_file('valid_spell_list.txt')
-    valid_words = [s.lower() for s in valid_words]
+    pwl_filepath = 'valid_spell_list_lower.txt'
+    with StageTimer(stats['timings'], 'load_dictionary_artifact'):
+        artifact = load_dictionary_artifact(
+            'valid_spell_list.txt', 'character_names.txt', pwl_filepath)
+    character_names = artifact['character_names']
+    valid_words = artifact['valid_words']
+    corrections_dict = artifact['corrections']
+    suggestion_cache_filepath = 'suggestion_cache.sqlite'
+    panel_memo_filepath = None
+    if args.panel_memo:
+        panel_memo_filepath = 'panel_memo.sqlite'
 
-    character_names = read_text_file('character_names.txt')
-    character_names = [s.lower() for s in character_names]
+    output_filepath = 'table.' + args.output_format
+    patch_header = None
+    if args.output_format == 'patch':
+        output_filepath = 'table_patch.jsonl'
+        patch_header = {'table_hash': compute_file_hash(table_filepath),
+                        'text_col_name': text_col_name}
+    # each output has its own manifest, so that an output is never reused with
+    #   the manifest of another
+    output_base, output_extension = os.path.splitext(output_filepath)
+    if output_extension in ('.parquet', '.feather'):
+        output_base += '_' + output_extension[1:]
+    manifest_filepath = output_base + '_manifest.json'
+    correction_map_filepath = 'correction_map.json'
 
-    valid_words.extend(character_names)
-    write_list_to_text_file(valid_words, 'valid_spell_list_lower.txt', 'w')
+    if args.suggester == 'symspell' or args.prefilter or args.segment:
+        from enchant.tokenize import get_tokenizer
+        with StageTimer(stats['timings'], 'count_corpus_words'):
+            word_frequencies = count_corpus_words(
+                read_table(table_filepath, text_col_name,
+                           columns=[text_col_name])[text_col_name],
+                get_tokenizer('en_US'))
 
-    dictionary = enchant.DictWithPWL('en_US', 'valid_spell_list_lower.txt')
-    checker = SpellChecker(dictionary)
-    tokenizer = get_tokenizer('en_US')
+    # the known words are checked once and stored with the dictionary
+    #   artifact, instead of by every process that builds a suggester
+    known_words = None
+    if args.suggester == 'symspell' or args.prefilter:
+        with StageTimer(stats['timings'], 'load_known_words'):
+            known_words = load_known_words(
+                pwl_filepath, args.dictionary_words,
+                list(valid_words) + list(word_frequencies))
 
-    customized_corrections = custom_corrections()
+    suggester_options = None
+    if args.suggester == 'symspell':
+        suggester_options = {'dic_filepath': args.dictionary_words,
+                             'word_frequencies': word_frequencies,
+                             'known_words': known_words}
+    if not args.prefilter:
+        known_words = None
 
-    message_interval = 100
-    comics_list = []
-    table_len = len(table)
+    segmenter = None
+    if args.segment:
+        with StageTimer(stats['timings'], 'build_word_segmenter'):
+            segmenter = WordSegmenter(pwl_filepath, word_frequencies)
 
-    for j in range(table_len):
+    secondary_dictionaries = None
+    if args.secondary_languages is not None:
+        secondary_dictionaries = SecondaryDictionaries(args.secondary_languages)
 
-        # loop status message
-        if (j % message_interval) == 0:
-            print('Processing file {0} of {1}, which is {2:.0f}%'
-                .format(j + 1, table_len, 100 * (j + 1) / table_len))
+    correctors = {'resources': None, 'pool': None, 'workers': args.workers}
+    with StageTimer(stats['timings'], 'load_spell_checker'):
+        if args.workers > 1:
+            correctors['pool'] = make_worker_pool(
+                args.workers, pwl_filepath, character_names,
+                suggestion_cache_filepath, suggester_options, corrections_dict,
+                known_words, panel_memo_filepath, args.skip_noise, segmenter,
+                secondary_dictionaries)
+        else:
+            correctors['resources'] = load_spell_checker(
+                pwl_filepath, character_names, suggestion_cache_filepath,
+                suggester_options, corrections_dict, known_words,
+                panel_memo_filepath, args.skip_noise, segmenter,
+                secondary_dictionaries)
 
-        panels_list = []
-        for i in range(len(table.iloc[j, table_col])):
-            panels_list.append(correct_string_misspellings(
-                table.iloc[j, table_col][i], customized_corrections,
-                character_names, dictionary, checker, tokenizer))
+    if args.vocabulary_first:
+        from enchant.tokenize import get_tokenizer
+        correctors['correction_map'] = {}
+        correctors['tokenizer'] = get_tokenizer('en_US')
 
-        comics_list.append(panels_list)
+    options_hash = make_options_hash(args.suggester, args.dictionary_words,
+                                     args.skip_noise, segmenter,
+                                     secondary_dictionaries)
 
-    text_corrected_col_name = 'text_spell_corrected'
-    table[text_corrected_col_name] = comics_list
+    try:
+        if args.chunksize:
+            run_parameters = {
+                'table_hash': compute_file_hash(table_filepath),
+                'chunksize': args.chunksize,
+                'options_hash': options_hash,
+                'valid_words_hash': hash_object(sorted(set(valid_words))),
+                'corrections_hash': hash_object(corrections_dict)}
+            row_records = correct_table_in_chunks(
+                table_filepath, text_col_name, args.chunksize, output_filepath,
+                run_parameters, stats, correctors, args.pipeline_depth)
+        else:
+            row_records = correct_whole_table(
+                table_filepath, text_col_name, output_filepath,
+                read_manifest(manifest_filepath), valid_words,
+                corrections_dict, stats, correctors, args.incremental,
+                patch_header, options_hash)
+
+    finally:
+        if correctors['pool'] is not None:
+            correctors['pool'].close()
+            correctors['pool'].join()
+        if correctors['resources'] is not None:
+            correctors['resources']['suggestion_cache'].close()
+            if correctors['resources']['panel_memo'] is not None:
+                correctors['resources']['panel_memo'].close()
+
+    if args.vocabulary_first:
+        write_correction_map(correctors['correction_map'],
+                             correction_map_filepath)
+
+    write_manifest(make_correction_manifest(row_records, valid_words,
+                                            corrections_dict, options_hash),
+                   manifest_filepath)
+
+    if profiler is not None:
+        stop_profiler(profiler, args.profile)
 
-    table.to_csv('table.csv', sep='^', index=False)
+    print(run_stats_report(stats, time.perf_counter() - start_time))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+
+import time
+import threading
+from collections import Counter
+
+import pytest
+
+from spell_check import run_staged_pipeline
+
+
+def run_pipeline_in_thread(items, process, consume):
+    '''
+    runs 'run_staged_pipeline' in a daemon thread with a queue size of 1 and
+        returns the exception it raised, or fails if it does not end
+    '''
+
+    raised = []
+
+    def run():
+        try:
+            run_staged_pipeline(items, process, consume, 1,
+                                {'pipeline': Counter()})
+        except Exception as e:
+            raised.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), 'pipeline did not end'
+
+    return(raised)
+
+
+def slow_process(item):
+    # slower than the queues' waits, so that stopped stages find them full
+    time.sleep(0.3)
+    return(item)
+
+
+def failing_items():
+    for i in range(3):
+        yield i
+    raise ValueError('reader')
+
+
+def failing_process(item):
+    if item == 5:
+        raise ValueError('process')
+    return(item)
+
+
+def failing_consume(item):
+    raise ValueError('writer')
+
+
+@pytest.mark.parametrize('items, process, consume, message', [
+    (failing_items(), slow_process, lambda x: None, 'reader'),
+    (range(50), failing_process, lambda x: None, 'process'),
+    (range(10), slow_process, failing_consume, 'writer')])
+def test_staged_pipeline_raises_stage_errors(items, process, consume,
+                                             message):
+
+    raised = run_pipeline_in_thread(items, process, consume)
+
+    assert len(raised) == 1
+    assert str(raised[0]) == message
+
+
+def test_staged_pipeline_consumes_in_order():
+
+    consumed = []
+    raised = run_pipeline_in_thread(range(5), slow_process, consumed.append)
+
+    assert raised == []
+    assert consumed == list(range(5))